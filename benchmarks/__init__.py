@@ -0,0 +1 @@
+"""Benchmarks for the My Fisker integration."""
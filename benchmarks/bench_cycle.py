@@ -0,0 +1,166 @@
+"""End-to-end benchmark of a coordinator update cycle.
+
+A cycle covers the token check or login, the WebSocket connect and verify,
+the profiles and digital_twin round trips, parsing, the imperial conversion
+for US accounts and the fan-out of the new snapshot to every sensor and
+binary sensor. The gateway simulator runs in its own process and answers
+every digital_twin request with the next recorded frame, so the snapshot
+changes every cycle like it does on a drive. The asleep scenario holds the
+first frame instead, like the gateway does while a car is parked overnight.
+
+Every scenario reports the p50/p95 latency, the CPU time spent by Home
+Assistant's event loop, the peak memory allocated during a cycle and what of
+it is still allocated afterwards. The peak includes the 256 KiB buffer asyncio
+reads from a socket into. Results are compared with the stored baselines:
+
+    python -m benchmarks.bench_cycle            # compare with the baselines
+    python -m benchmarks.bench_cycle --save     # store new baselines
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+import statistics
+import sys
+import time
+import tracemalloc
+
+from .harness import async_add_entry, hass_instance, simulator
+
+BASELINES = Path(__file__).parent / "baselines" / "bench_cycle.json"
+
+METRICS = ("p50_ms", "p95_ms", "cpu_ms", "alloc_kib", "retained_kib")
+
+# Increase of the CPU time or allocations over the baseline flagged as regression
+TOLERANCE = 0.5
+# Smaller increases are timer and allocator noise on sub-millisecond cycles
+NOISE_FLOOR = {"cpu_ms": 1.0, "alloc_kib": 32.0}
+
+
+@dataclass
+class Scenario:
+    """Conditions a cycle is measured under."""
+
+    name: str
+    region: str
+    vehicles: int
+    cold: bool
+    simulator_options: tuple[str, ...] = ("--step",)
+
+
+SCENARIOS = [
+    Scenario("warm-eu-1", "EU", 1, False),
+    Scenario("cold-eu-1", "EU", 1, True),
+    Scenario("warm-us-1", "US", 1, False),
+    Scenario("warm-eu-3", "EU", 3, False),
+    Scenario("cold-eu-3", "EU", 3, True),
+    Scenario("asleep-eu-1", "EU", 1, False, ("--speed", "0")),
+]
+
+
+async def run_scenario(scenario: Scenario, rounds: int) -> dict[str, float]:
+    async with simulator(scenario.vehicles, *scenario.simulator_options) as (url, vins):
+        async with hass_instance() as hass:
+            # One config entry serves all vehicles on the account
+            entry = await async_add_entry(hass, url, scenario.region, vins[0], "Ocean")
+            coordinators = [hass.data["my_fisker"][entry.entry_id]._coordinator]
+
+            async def refresh(coordinator):
+                if scenario.cold:
+                    # Log in and connect again, like after a restart
+                    await coordinator.token_manager.async_refresh(force=True)
+                await coordinator.async_refresh()
+
+            async def cycle():
+                if scenario.cold:
+                    for coordinator in coordinators:
+                        await coordinator.my_fisker_api.CloseAsync()
+
+                start = time.perf_counter()
+                cpu = time.process_time()
+                await asyncio.gather(*(refresh(c) for c in coordinators))
+                cpu = time.process_time() - cpu
+                latency = time.perf_counter() - start
+
+                await hass.async_block_till_done()
+                if not all(c.last_update_success for c in coordinators):
+                    raise RuntimeError(f"Update failed in scenario {scenario.name}")
+                return latency, cpu
+
+            for _ in range(3):
+                await cycle()
+
+            latencies, cpu_times = zip(*[await cycle() for _ in range(rounds)])
+
+            tracemalloc.start()
+            allocated, retained = [], []
+            for _ in range(max(rounds // 5, 3)):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                await cycle()
+                after, peak = tracemalloc.get_traced_memory()
+                allocated.append(peak - before)
+                retained.append(after - before)
+            tracemalloc.stop()
+
+            await hass.config_entries.async_unload(entry.entry_id)
+
+    return {
+        "p50_ms": round(statistics.median(latencies) * 1e3, 2),
+        "p95_ms": round(statistics.quantiles(latencies, n=20)[18] * 1e3, 2),
+        "cpu_ms": round(statistics.median(cpu_times) * 1e3, 2),
+        "alloc_kib": round(statistics.median(allocated) / 1024, 1),
+        "retained_kib": round(statistics.median(retained) / 1024, 1),
+    }
+
+
+def compare(results: dict, baselines: dict) -> list[str]:
+    """Print the results next to the baselines, returning the regressions."""
+    regressions = []
+    print(f"{'scenario':<12}" + "".join(f"{m:>14}" for m in METRICS))
+    for name, result in results.items():
+        print(f"{name:<12}" + "".join(f"{result[m]:>14}" for m in METRICS))
+        if (baseline := baselines.get(name)) is None:
+            continue
+
+        print(f"{'  baseline':<12}" + "".join(f"{baseline[m]:>14}" for m in METRICS))
+        # Latency depends too much on the machine's load to be compared
+        for metric, floor in NOISE_FLOOR.items():
+            increase = result[metric] - baseline[metric]
+            if increase > max(baseline[metric] * TOLERANCE, floor):
+                regressions.append(f"{name} {metric}")
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    results = {}
+    for scenario in SCENARIOS:
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        results[scenario.name] = await run_scenario(scenario, args.rounds)
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    regressions = compare(results, baselines)
+
+    if args.save:
+        BASELINES.parent.mkdir(exist_ok=True)
+        BASELINES.write_text(json.dumps({**baselines, **results}, indent=2) + "\n")
+        print(f"Baselines saved to {BASELINES}")
+    elif regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_cycle")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--scenario", action="append", help="only run this scenario")
+    parser.add_argument("--save", action="store_true", help="store as baselines")
+    logging.basicConfig(level=logging.ERROR)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,168 @@
+"""Micro-benchmark of the fan-out of an update to the entities.
+
+Compares the CPU time per entity update of the former handling, where every
+update picked the conversion by substring tests on the key and parsed and
+converted timestamps from scratch, with the value handlers bound to each
+entity at setup and the memoized timestamp service. Writing the state to Home Assistant is
+left out of both, it is the same for either.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fanout
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+import json
+from pathlib import Path
+import time
+from types import SimpleNamespace
+
+from homeassistant.const import Platform
+import homeassistant.util.dt as dt_util
+import pytz
+
+from custom_components.my_fisker import binary_sensor, sensor
+from custom_components.my_fisker.api import MyFiskerAPI
+from custom_components.my_fisker.const import (
+    CAR_SETTINGS,
+    CHARGESTAT,
+    CLIMATE_CONTROL_SEAT_HEAT,
+    CLIMATE_CONTROL_STEERING_WHEEL_HEAT,
+    DOOR_LOCK,
+    GEAR_IN_PARK,
+    TRIPSTAT,
+)
+from custom_components.my_fisker.registry import REGISTRY
+from custom_components.my_fisker.timestamps import TimestampService
+
+PAYLOADS = Path(__file__).parent / "payloads"
+ROUNDS = 2000
+VIN = "VCF1ZBU27PG000001"
+TIME_ZONE = "Europe/Copenhagen"
+
+
+def make_coordinator():
+    """Return a stand-in for the coordinator, holding one vehicle's data."""
+    api = MyFiskerAPI("benchmark", "benchmark", "EU", VIN)
+    twin = api.ParseDigitalTwinResponse(json.load(open(PAYLOADS / "digital_twin.json")))
+    api.data[CAR_SETTINGS] = {
+        VIN: api.ParseCarSettingsResponse(
+            json.load(open(PAYLOADS / "car_settings.json"))
+        )
+    }
+    stats = {
+        description.key: 0.0
+        for source in (TRIPSTAT, CHARGESTAT)
+        for description in REGISTRY.descriptions(Platform.SENSOR, source)
+    }
+    return SimpleNamespace(
+        data={VIN: api.flatten_json(twin)},
+        stats={VIN: stats},
+        my_fisker_api=api,
+        _hass=SimpleNamespace(config=SimpleNamespace(time_zone=TIME_ZONE)),
+        timestamps=TimestampService(dt_util.get_time_zone(TIME_ZONE)),
+        vehicle_name=lambda vin: "Ocean",
+    )
+
+
+def make_entities(coordinator) -> list:
+    """Return the entities of one vehicle, with writing their state left out."""
+    entities = []
+    for key in coordinator.data[VIN]:
+        if description := REGISTRY.get(Platform.SENSOR, key):
+            entities.append(
+                sensor.FiskerSensor(coordinator, (VIN, key), description, None)
+            )
+        if description := REGISTRY.get(Platform.BINARY_SENSOR, key):
+            entities.append(
+                binary_sensor.FiskerSensor(coordinator, (VIN, key), description, None)
+            )
+    for source in (CAR_SETTINGS, TRIPSTAT, CHARGESTAT):
+        for description in REGISTRY.descriptions(Platform.SENSOR, source):
+            entities.append(
+                sensor.FiskerSensor(coordinator, (VIN, source), description, None)
+            )
+
+    for entity in entities:
+        entity.async_write_ha_state = lambda: None
+    return entities
+
+
+def update_before(entity):
+    """Update as done before: pick the conversion by substring tests on the key."""
+    coordinator = entity._coordinator
+    key = entity.entity_description.key
+
+    if isinstance(entity, binary_sensor.FiskerSensor):
+        value = coordinator.data[entity.vin][entity.idx[1]]
+        if "doors_" in key:
+            entity._attr_state = DOOR_LOCK[value][0]
+        elif "gear_in_park" in key:
+            entity._attr_state = GEAR_IN_PARK[value][0]
+        elif "climate_control_steering_wheel_heat" in key:
+            entity._attr_state = CLIMATE_CONTROL_STEERING_WHEEL_HEAT[value][0]
+        else:
+            entity._attr_state = value
+        entity._attr_available = True
+        return
+
+    data_available = False
+    if "car_settings" in key:
+        setting = entity.entity_description.get_car_settings_value(
+            coordinator.my_fisker_api.GetCarSettings(entity.vin)
+        )
+        if "_updated" in key:
+            hass_tz = coordinator._hass.config.time_zone
+            local_time = setting.updated.astimezone(pytz.timezone(hass_tz))
+            entity._attr_native_value = local_time.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            entity._attr_native_value = setting.value
+        data_available = True
+    elif "tripstat" in key or "chargestat" in key:
+        stats = coordinator.stats.get(entity.vin, {})
+        data_available = key in stats
+        entity._attr_native_value = stats.get(key)
+    else:
+        value = coordinator.data[entity.vin][entity.idx[1]]
+        data_available = True
+        if "seat_heat" in key:
+            entity._attr_native_value = CLIMATE_CONTROL_SEAT_HEAT[value][0]
+        elif "updated" in key:
+            utc_time = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            hass_tz = coordinator._hass.config.time_zone
+            local_time = utc_time.astimezone(pytz.timezone(hass_tz))
+            entity._attr_native_value = local_time.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            entity._attr_native_value = value
+    entity._attr_available = data_available
+
+
+def update_after(entity):
+    """Update through the value handler bound at setup."""
+    entity._handle_coordinator_update()
+
+
+def measure(update, entities: list) -> float:
+    """Return the CPU time per entity update in microseconds."""
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        for entity in entities:
+            update(entity)
+    return (time.process_time() - start) / (ROUNDS * len(entities)) * 1e6
+
+
+def main():
+    entities = make_entities(make_coordinator())
+
+    before = measure(update_before, entities)
+    after = measure(update_after, entities)
+
+    print(f"entities: {len(entities)}")
+    print(f"before: {before:8.2f} us/update")
+    print(f"after:  {after:8.2f} us/update  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark of the digital twin flattening.
+
+Compares MyFiskerAPI.flatten_json, which flattens the whole payload, with the
+DigitalTwinExtractor built from the registered entity descriptions, on the
+recorded digital_twin payload.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_flatten
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import time
+
+from custom_components.my_fisker.api import MyFiskerAPI
+from custom_components.my_fisker.entities_binary_sensor import BINARY_SENSORS
+from custom_components.my_fisker.entities_sensor import SENSORS_DIGITAL_TWIN
+from custom_components.my_fisker.extractor import DigitalTwinExtractor
+
+PAYLOADS = Path(__file__).parent / "payloads"
+ROUNDS = 20000
+
+
+def measure(func, payload: dict) -> float:
+    """Return the CPU time per payload in microseconds."""
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        func(payload)
+    return (time.process_time() - start) / ROUNDS * 1e6
+
+
+def main():
+    payload = json.load(open(PAYLOADS / "digital_twin.json"))["data"]
+
+    api = MyFiskerAPI("", "", "EU")
+    extractor = DigitalTwinExtractor(
+        sensor.key for sensor in (*SENSORS_DIGITAL_TWIN, *BINARY_SENSORS)
+    )
+    discovered = extractor.discover(payload)
+    extracted = extractor.extract(payload)
+
+    # Every extracted value must match the full flattening
+    flat = api.flatten_json(payload)
+    assert discovered == extracted
+    assert all(flat[key] == value for key, value in extracted.items())
+
+    before = measure(api.flatten_json, payload)
+    after = measure(extractor.extract, payload)
+
+    print(f"keys: {len(flat)} flattened, {len(extracted)} extracted")
+    print(f"flatten_json: {before:8.2f} us/payload")
+    print(f"extractor:    {after:8.2f} us/payload  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Micro-benchmark of WebSocket frame decoding.
+
+Compares the CPU time per frame of the former handling, where a frame was run
+through json.loads once for its handler and again by the parser, with the
+decode-once routing of MyFiskerConnection.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_frames
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import time
+
+from custom_components.my_fisker.connection import MyFiskerConnection, json_loads
+
+PAYLOADS = Path(__file__).parent / "payloads"
+ROUNDS = 20000
+
+
+def load_frames() -> list[str]:
+    """Return the recorded frames as they arrive on the socket."""
+    return [
+        json.dumps(json.load(open(PAYLOADS / name)))
+        for name in ("car_settings.json", "profiles.json", "digital_twin.json")
+    ]
+
+
+def decode_before(frames: list[str]):
+    """Decode as done before: once for the handler, once more by the parser."""
+    for frame in frames:
+        handler = json.loads(frame)["handler"]
+        if handler in ("digital_twin", "profiles", "car_settings"):
+            json.loads(frame)["data"]
+
+
+def decode_after(connection: MyFiskerConnection, frames: list[str]):
+    """Decode once and route the decoded frame to the registered callbacks."""
+    for frame in frames:
+        decoded = json_loads(frame)
+        connection._dispatch(decoded["handler"], decoded)
+
+
+def measure(func, *args) -> float:
+    """Return the CPU time per frame in microseconds."""
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        func(*args)
+    return (time.process_time() - start) / (ROUNDS * len(args[-1])) * 1e6
+
+
+def main():
+    frames = load_frames()
+
+    connection = MyFiskerConnection("ws://localhost/mobile", {}, None, None)
+    for handler in ("digital_twin", "profiles", "car_settings"):
+        connection.register(handler, lambda frame, solicited: frame["data"])
+
+    before = measure(decode_before, frames)
+    after = measure(decode_after, connection, frames)
+
+    print(f"JSON backend: {json_loads.__module__}")
+    print(f"before: {before:8.2f} us/frame")
+    print(f"after:  {after:8.2f} us/frame  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Home Assistant and gateway simulator set-up shared by the end-to-end benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+import os
+from pathlib import Path
+import sys
+import tempfile
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.core import HomeAssistant
+
+from custom_components.my_fisker.scheduler import DATA_SCHEDULER, MyFiskerScheduler
+from custom_components.my_fisker.shared import async_get_shared
+
+ROOT = Path(__file__).parent.parent
+RECORDINGS = ("drive", "charge", "parked_night")
+
+
+@asynccontextmanager
+async def simulator(vehicles: int = 1, *options: str):
+    """Run the gateway simulator in its own process and yield its base URL.
+
+    Running it in another process keeps its CPU time and allocations out of
+    what is measured. One bundled recording is served per vehicle.
+    """
+    args = [sys.executable, "-u", "-m", "simulator", "serve", "--port", "0"]
+    for name in RECORDINGS[:vehicles]:
+        args += ["--recording", name]
+
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        *options,
+        cwd=ROOT,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        while not (line := (await process.stdout.readline()).decode()).startswith(
+            "Serving"
+        ):
+            if not line:
+                raise RuntimeError("Gateway simulator did not start")
+        vins, url = line.removeprefix("Serving ").strip().split(" on ")
+        yield url, vins.split(", ")
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+@asynccontextmanager
+async def hass_instance():
+    """Yield a minimal Home Assistant instance loading the integration from this tree."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(ROOT / "custom_components", Path(config_dir) / "custom_components")
+        hass = HomeAssistant(config_dir)
+        hass.config.skip_pip = True
+        loader.async_setup(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await bootstrap.async_load_base_functionality(hass)
+
+        # Cycles are run back to back, the rate limit would only measure itself
+        async_get_shared(hass).async_get(
+            DATA_SCHEDULER, lambda: MyFiskerScheduler(rate=1e6, burst=1000)
+        )
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+async def async_add_entry(
+    hass: HomeAssistant, url: str, region: str, vin: str, alias: str
+) -> config_entries.ConfigEntry:
+    """Add and set up a config entry served by the simulator at url."""
+    entry = config_entries.ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain="my_fisker",
+        title=alias,
+        data={
+            "username": "benchmark",
+            "password": "benchmark",
+            "region": region,
+            "alias": alias,
+            "vin": vin,
+            "base_url": url,
+        },
+        source="user",
+        options={},
+    )
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    return entry
@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import asyncio.timeouts
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import timedelta
 import logging
+import math
+import time
+from typing import Any
 
 from homeassistant.components.button import ButtonEntityDescription
 from homeassistant.components.sensor import SensorEntityDescription
@@ -17,22 +21,61 @@ from homeassistant.const import (
     CONF_USERNAME,
     Platform,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-
-from .api import MyFiskerAPI
-from .const import DOMAIN, TRIM_EXTREME_ULTRA_BATT_CAPACITY, TRIM_SPORT_BATT_CAPACITY
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
+
+from .api import AuthenticationError, MyFiskerAPI, MyFiskerApiError
+from .auth import MyFiskerTokenManager, async_remove_token
+from .client import async_get_client
+from .commands import COMMAND_EFFECTS, CommandQueue, PendingConfirmation
+from .extractor import DigitalTwinExtractor
+from .policy import AdaptivePollingPolicy, PollingPolicy
+from .resilience import CircuitBreaker, async_retry
+from .scheduler import ScheduledPoller, async_get_scheduler
+from .shared import async_unload_shared
+from .const import (
+    API_TIMEOUT,
+    CADENCE_LIVE,
+    CAR_SETTINGS,
+    CHARGESTAT,
+    COMMAND_BURST_INTERVAL,
+    COMMAND_BURST_POLLS,
+    CONF_BASE_URL,
+    DIGITAL_TWIN,
+    DOMAIN,
+    POLL_PARKED,
+    TRIM_EXTREME_ULTRA_BATT_CAPACITY,
+    TRIM_SPORT_BATT_CAPACITY,
+    TRIPSTAT,
+)
 from .stats import TripStats
+from .timestamps import async_get_timestamps
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.BUTTON, Platform.SENSOR]
 
+# Digital twin values read by the coordinator itself, by the polling policy, the
+# trip and charge stats and the state expected after commands, whether or not
+# an entity shows them
+COORDINATOR_KEYS = frozenset(
+    {
+        "updated",
+        "gear_in_park",
+        "vehicle_speed_speed",
+        "battery_charge_type",
+        "battery_percent",
+        "battery_total_mileage_odometer",
+        "door_locks_driver",
+    }
+).union(*COMMAND_EFFECTS.values())
+
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the My Fisker component."""
 
-    hass.data[DOMAIN] = {}
+    hass.data.setdefault(DOMAIN, {})
     return True
 
 
@@ -41,15 +84,47 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
 
+    # Imported here, as the entity modules import their descriptions from this module
+    from .registry import REGISTRY
+
     data = entry.data
     myFiskerApi = MyFiskerAPI(
-        data[CONF_USERNAME], data[CONF_PASSWORD], data[CONF_REGION]
+        data[CONF_USERNAME],
+        data[CONF_PASSWORD],
+        data[CONF_REGION],
+        data.get("vin", ""),
+        async_get_client(hass).session,
+        DigitalTwinExtractor(REGISTRY.keys(DIGITAL_TWIN) | COORDINATOR_KEYS),
+        data.get(CONF_BASE_URL, ""),
     )
-    await myFiskerApi.GetAuthTokenAsync()
+    token_manager = MyFiskerTokenManager(hass, myFiskerApi, entry.entry_id)
+    await token_manager.async_load()
 
     # Fetch initial data so we have data when entities subscribe
-    coordinator = MyFiskerCoordinator(hass, myFiskerApi, data[CONF_ALIAS])
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = MyFiskerCoordinator(
+        hass,
+        myFiskerApi,
+        data[CONF_ALIAS],
+        token_manager,
+        async_get_scheduler(hass).async_register(),
+    )
+    coordinator.async_add_cadences(REGISTRY.descriptions(Platform.SENSOR))
+    coordinator.async_add_cadences(REGISTRY.descriptions(Platform.BINARY_SENSOR))
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Setup is retried with a new API, so stop this one refreshing and close its socket
+        token_manager.async_shutdown()
+        async_get_scheduler(hass).async_unregister(coordinator.poller)
+        await myFiskerApi.CloseAsync()
+        raise
+
+    # Frames pushed by the gateway update the entities right away
+    entry.async_on_unload(
+        myFiskerApi.AddPushListener(
+            coordinator.async_handle_push, coordinator.async_reconnect_hold_off
+        )
+    )
 
     hass.data[DOMAIN][entry.entry_id] = HassMyFisker(
         entry.data[CONF_USERNAME],
@@ -67,11 +142,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        my_fisker: HassMyFisker = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = my_fisker._coordinator
+        coordinator.token_manager.async_shutdown()
+        async_get_scheduler(hass).async_unregister(coordinator.poller)
+        await coordinator.my_fisker_api.CloseAsync()
+        await async_unload_shared(hass)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the access token stored for a deleted config entry."""
+    await async_remove_token(hass, entry.entry_id)
+
+
 class HassMyFisker:
     def __init__(
         self,
@@ -99,9 +184,22 @@ class HassMyFisker:
 
 
 class MyFiskerCoordinator(DataUpdateCoordinator):
-    """My Fisker coordinator."""
+    """My Fisker coordinator, holding a snapshot of every vehicle on the account.
+
+    The data is the flattened digital twin of each vehicle, by VIN. Entities are
+    bound to a VIN, and their coordinator context is the (VIN, key) pair of the
+    value they show.
+    """
 
-    def __init__(self, hass, my_api: MyFiskerAPI, alias: str):
+    def __init__(
+        self,
+        hass,
+        my_api: MyFiskerAPI,
+        alias: str,
+        token_manager: MyFiskerTokenManager,
+        poller: ScheduledPoller,
+        policy: PollingPolicy | None = None,
+    ):
         """Initialize my coordinator."""
         super().__init__(
             hass,
@@ -113,44 +211,443 @@ class MyFiskerCoordinator(DataUpdateCoordinator):
         )
         self._hass = hass
         self.my_fisker_api = my_api
+        self.token_manager = token_manager
+        self.poller = poller
+        self.timestamps = async_get_timestamps(hass)
+        self.commands = CommandQueue(my_api)
+        self._confirmations: dict[str, PendingConfirmation] = {}
+        self.policy = policy or AdaptivePollingPolicy()
+        self.failures = 0
+        self.breaker = CircuitBreaker()
+        self._poll_interval = self.update_interval
         self._alias = alias
-        self.tripstats: TripStats = TripStats()
-        self.chargestats: TripStats = TripStats()
+        self.tripstats: dict[str, TripStats] = {}
+        self.chargestats: dict[str, TripStats] = {}
+        self.stats: dict[str, dict[str, Any]] = {}
+
+        self._previous_data: dict | None = None
+        self._previous_car_settings: dict | None = None
+        self._cadences: dict[float, set[str]] = {}
+        self._cadence_checked: dict[float, float] = {}
+        self._cached_keys: set[str] = set()
+        self._served: dict[str, dict[str, Any]] = {}
+        self._car_settings_max_age = math.inf
+        self._car_settings_requested = -math.inf
+        self._notified_update_success = True
+        self._notified_listeners: set = set()
+        self.writes_issued = 0
+        self.writes_suppressed = 0
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the entities whose keys changed since the previous update."""
+        data = self.data if self.last_update_success else None
+        previous = self._previous_data
+        changed = self._async_changed_keys(data)
+
+        # Nothing to do if the gateway returned the same snapshots again
+        if changed is not None and not changed:
+            if self._notified_listeners.issuperset(self._listeners):
+                self.writes_suppressed += len(self._listeners)
+                return
+
+        # Trip and charge stats are calculated once per new snapshot of a vehicle
+        if data:
+            changed_vins = None if changed is None else {vin for vin, _ in changed}
+            for vin, digital_twin in data.items():
+                if changed_vins is not None and vin not in changed_vins:
+                    continue
+                stats = self.stats.get(vin, {})
+                self._async_update_stats(vin, digital_twin, (previous or {}).get(vin))
+                if changed is not None:
+                    changed.update(
+                        (vin, key.split("_", 1)[0])
+                        for key, value in self.stats[vin].items()
+                        if stats.get(key) != value
+                    )
+
+        for remove_listener, (update_callback, context) in list(
+            self._listeners.items()
+        ):
+            # Entities never written by an update count as changed
+            if (
+                changed is None
+                or remove_listener not in self._notified_listeners
+                or context in changed
+            ):
+                update_callback()
+                self._notified_listeners.add(remove_listener)
+                self.writes_issued += 1
+            else:
+                self.writes_suppressed += 1
+
+        # Forget the entities removed meanwhile
+        self._notified_listeners.intersection_update(self._listeners)
+
+    @callback
+    def _async_changed_keys(self, data: dict | None) -> set[tuple[str, str]] | None:
+        """Return the (VIN, key) pairs changed since the previous update.
+
+        None is returned if all entities must update.
+        """
+        previous, self._previous_data = self._previous_data, (
+            dict(data) if data else None
+        )
+        car_settings = dict(self.my_fisker_api.data.get(CAR_SETTINGS, {}))
+        previous_car_settings, self._previous_car_settings = (
+            self._previous_car_settings or {},
+            car_settings,
+        )
+
+        # Availability changes must reach every entity
+        if self._notified_update_success != self.last_update_success:
+            self._notified_update_success = self.last_update_success
+            return None
+        if previous is None or data is None:
+            if data is not None:
+                self._async_changed_cached_keys(data, force=True)
+            return None
+
+        changed = set()
+        cached = self._cached_keys
+        for vin, digital_twin in data.items():
+            if car_settings.get(vin) != previous_car_settings.get(vin):
+                changed.add((vin, CAR_SETTINGS))
+
+            # Unchanged snapshots are returned by the API as the same object
+            before = previous.get(vin, {})
+            if digital_twin is before:
+                continue
+            changed.update(
+                (vin, key)
+                for key, value in digital_twin.items()
+                if before.get(key) != value and key not in cached
+            )
+            changed.update(
+                (vin, key) for key in before.keys() - digital_twin.keys() - cached
+            )
+
+        changed.update(self._async_changed_cached_keys(data))
+        return changed
+
+    @callback
+    def async_add_cadences(self, descriptions: Iterable[FiskerSensorEntityDescription]):
+        """Take the max_age of entity descriptions into account.
+
+        Digital twin keys with a max_age are not compared on every update, only
+        once their max_age has passed. The car settings are requested again once
+        they are older than the shortest max_age of the car settings entities.
+        """
+        for description in descriptions:
+            if description.key.startswith(CAR_SETTINGS):
+                self._car_settings_max_age = min(
+                    self._car_settings_max_age, description.max_age
+                )
+            elif description.max_age > CADENCE_LIVE:
+                self._cadences.setdefault(description.max_age, set()).add(
+                    description.key
+                )
+                self._cached_keys.add(description.key)
+
+    @callback
+    def _async_changed_cached_keys(
+        self, data: dict[str, dict], force: bool = False
+    ) -> set[tuple[str, str]]:
+        """Return the (VIN, key) pairs of cached keys due and changed since they were served."""
+        now = time.monotonic()
+        due: set[str] = set()
+        for max_age, keys in self._cadences.items():
+            if force or now - self._cadence_checked.get(max_age, -math.inf) >= max_age:
+                self._cadence_checked[max_age] = now
+                due |= keys
+
+        changed = set()
+        for vin, digital_twin in data.items():
+            served = self._served.setdefault(vin, {})
+            for key in due:
+                value = digital_twin.get(key)
+                if key not in served or served[key] != value:
+                    served[key] = value
+                    changed.add((vin, key))
+        return changed
+
+    async def _async_refresh_car_settings(self):
+        """Request the car settings again once they are older than their entities allow.
+
+        A failure is only logged, the car settings received before are kept.
+        """
+        now = time.monotonic()
+        age = min(
+            self.my_fisker_api.CarSettingsAge(), now - self._car_settings_requested
+        )
+        if age < self._car_settings_max_age:
+            return
+
+        self._car_settings_requested = now
+        try:
+            async with asyncio.timeout(API_TIMEOUT):
+                await self.my_fisker_api.RefreshCarSettings()
+        except (TimeoutError, MyFiskerApiError) as err:
+            _LOGGER.debug("Refreshing the car settings failed: %s", err)
+
+    def snapshot_age(self, vin: str) -> float | None:
+        """Return the seconds since the snapshot of a vehicle was taken, None if unknown."""
+        try:
+            updated = self.timestamps.as_datetime(self.data[vin]["updated"])
+        except (KeyError, TypeError):
+            return None
+        if updated is None:
+            return None
+        return (dt_util.utcnow() - updated).total_seconds()
+
+    def vehicle_name(self, vin: str) -> str:
+        """Return the name of a vehicle, the alias with the end of the VIN for all but the first."""
+        if vin == self.my_fisker_api.vin:
+            return self._alias
+        return f"{self._alias} {vin[-6:]}"
+
+    @staticmethod
+    def battery_capacity(vin: str):
+        # VCF1Z = One, VCF1E = Extreme, VCF1U = Ultra VCF1S = Sport
+        trim_extreme_ultra = ["VCF1Z", "VCF1E", "VCF1U"]
+        trim_sport = ["VCF1s"]
+        if vin[0:5] in trim_extreme_ultra:
+            return TRIM_EXTREME_ULTRA_BATT_CAPACITY
+        if vin[0:5] in trim_sport:
+            return TRIM_SPORT_BATT_CAPACITY
+        else:
+            return 0
+
+    @callback
+    def _async_update_stats(self, vin: str, data: dict, previous: dict | None):
+        """Run the trip and charge state machines once for a new snapshot of a vehicle."""
+        previous = previous or {}
+        tripstats = self.tripstats.setdefault(vin, TripStats())
+        chargestats = self.chargestats.setdefault(vin, TripStats())
+        battery = data["battery_percent"]
+        distance = data["battery_total_mileage_odometer"]
+        battery_changed = battery != previous.get("battery_percent")
+        distance_changed = distance != previous.get("battery_total_mileage_odometer")
+
+        # Trip: parked -> driving starts a trip, driving -> parked ends it
+        carStartedDriving = (
+            tripstats.vehicleParked is True and data["gear_in_park"] is False
+        )
+        carIsDriving = (
+            tripstats.vehicleParked is False and data["gear_in_park"] is False
+        )
+        tripstats.vehicleParked = data["gear_in_park"]
+
+        if carStartedDriving:
+            tripstats.Clear()
+            tripstats.add_battery(battery)
+            tripstats.add_distance(distance)
+        elif carIsDriving:
+            if battery_changed:
+                tripstats.add_battery(battery)
+            if distance_changed:
+                tripstats.add_distance(distance)
+
+        # Charge: stats are cleared when charging ends
+        carIsCharging = chargestats.carIsRunning is False
+        carEndedCharging = False
+        if carIsCharging and "Initial_value" in data["battery_charge_type"]:
+            carIsCharging = False
+            carEndedCharging = True
+
+        chargestats.carIsRunning = "charging" not in data["battery_charge_type"]
+        chargestats.vehicleParked = data["gear_in_park"]
+
+        if carEndedCharging:
+            chargestats.Clear()
+            chargestats.add_battery(battery)
+            chargestats.add_distance(distance)
+        elif carIsCharging is False:
+            if battery_changed:
+                chargestats.add_battery(battery)
+            if distance_changed:
+                chargestats.add_distance(distance)
+
+        self.stats[vin] = {
+            **self._calculate_stats(vin, TRIPSTAT, tripstats),
+            **self._calculate_stats(vin, CHARGESTAT, chargestats),
+        }
+
+    def _calculate_stats(
+        self, vin: str, prefix: str, stats: TripStats
+    ) -> dict[str, Any]:
+        batt_factor = self.battery_capacity(vin) / 100
+        try:
+            # batt, dist and time must be read first, the others are derived from them
+            values = {
+                f"{prefix}_battery": round(stats.batt * batt_factor, 2),
+                f"{prefix}_distance": stats.dist,
+                f"{prefix}_duration": stats.time,
+            }
+        except IndexError:
+            # No samples yet for the current trip or charge
+            previous = self.stats.get(vin, {})
+            return {k: v for k, v in previous.items() if k.startswith(prefix)}
+
+        values[f"{prefix}_efficiency"] = round(stats.efficiency * batt_factor, 2)
+        values[f"{prefix}_efficiency_dist"] = (
+            round(stats.efficiency_dist / batt_factor, 2) if batt_factor else 0
+        )
+        values[f"{prefix}_prevefficiency"] = round(
+            stats.previous_efficiency * batt_factor, 2
+        )
+        values[f"{prefix}_speed"] = stats.average_speed
+        return values
+
+    @callback
+    def async_handle_push(self, handler: str):
+        """Update the entities with a digital_twin or car_settings frame pushed by the gateway."""
+        _LOGGER.debug("Fisker pushed '%s' frame", handler)
+        if data := self.my_fisker_api.data.get(DIGITAL_TWIN):
+            self.async_set_updated_data(self._apply_confirmations(dict(data)))
+
+    @callback
+    def async_expect_command(self, vin: str, command: str):
+        """Show the state expected after an acknowledged command right away.
+
+        The vehicle takes a while to run a command and report it, so it is
+        polled every COMMAND_BURST_INTERVAL until it does, at most
+        COMMAND_BURST_POLLS times, before going back to the normal interval.
+        """
+        self._confirmations[vin] = PendingConfirmation(
+            command,
+            COMMAND_EFFECTS.get(command, {}),
+            dt_util.utcnow(),
+            COMMAND_BURST_POLLS,
+        )
+        self._poll_interval = timedelta(seconds=COMMAND_BURST_INTERVAL)
+        self.update_interval = self.poller.next_interval(self._poll_interval)
+
+        # Also reschedules the next poll with the burst interval
+        if data := self.my_fisker_api.data.get(DIGITAL_TWIN):
+            self.async_set_updated_data(self._apply_confirmations(dict(data)))
+
+    def _apply_confirmations(self, data: dict[str, dict], polled: bool = False):
+        """Apply the state expected after commands to the digital twins, by VIN.
+
+        Expectations confirmed or contradicted by the vehicle are dropped, as
+        are those not resolved after their last poll.
+        """
+        for vin, confirmation in list(self._confirmations.items()):
+            if (digital_twin := data.get(vin)) is None:
+                continue
+            if polled:
+                confirmation.polls_left -= 1
+            updated = self.timestamps.as_datetime(digital_twin.get("updated"))
+            if confirmation.resolve(digital_twin, updated):
+                del self._confirmations[vin]
+            elif confirmation.polls_left <= 0:
+                _LOGGER.debug("Command '%s' not reported in time", confirmation.command)
+                del self._confirmations[vin]
+            else:
+                data[vin] = confirmation.overlay(digital_twin)
+        return data
+
+    @callback
+    def async_reconnect_hold_off(self) -> float:
+        """Return the seconds to wait before re-opening a dropped connection.
+
+        While the breaker is open, the gateway is left alone by the connection too.
+        """
+        return self.breaker.retry_after()
+
+    def _schedule_next_poll(self, digital_twins: dict[str, dict]):
+        """Set the interval until the next poll as chosen by the polling policy.
+
+        The interval is picked up by the coordinator when it schedules the next
+        refresh after this one, so no refresh is triggered from here.
+        """
+        previous_interval = self._poll_interval
+        self._poll_interval = self.policy.next_interval(
+            digital_twins,
+            dt_util.utcnow(),
+            self.failures,
+            self.my_fisker_api.IsPushActive(),
+        )
+        if self._confirmations:
+            self._poll_interval = min(
+                self._poll_interval, timedelta(seconds=COMMAND_BURST_INTERVAL)
+            )
+        if not self._notified_listeners:
+            # No back off before the entities have been updated once
+            self._poll_interval = min(
+                self._poll_interval, timedelta(seconds=POLL_PARKED)
+            )
+        if retry_after := self.breaker.retry_after():
+            # No polls at all until the breaker lets a probe through
+            self._poll_interval = max(
+                self._poll_interval, timedelta(seconds=retry_after)
+            )
+        self.update_interval = self.poller.next_interval(self._poll_interval)
+
+        # Log only if the update interval has changed
+        if self._poll_interval != previous_interval:
+            _LOGGER.info(
+                "Fisker refresh rate changed from %s to %s",
+                previous_interval,
+                self._poll_interval,
+            )
+
+    async def _async_fetch_digital_twins(self) -> dict[str, dict]:
+        await self.token_manager.async_get_token()
+        try:
+            return await self.my_fisker_api.GetDigitalTwins()
+        except AuthenticationError:
+            # Token rejected by the gateway, log in again and retry once
+            await self.token_manager.async_refresh(force=True)
+            return await self.my_fisker_api.GetDigitalTwins()
 
     async def _async_update_data(self):
         # Fetch data from API endpoint. This is the place to pre-process the data to lookup tables so entities can quickly look up their data.
-        try:
-            async with asyncio.timeout(30):
-                await self.my_fisker_api.GetAuthTokenAsync()
-                retData = await self.my_fisker_api.GetDigitalTwin()
-
-                self._previous_update_interval = self.update_interval
-
-                # Dynamic refresh rate, based on door lock status
-                if retData.get("door_locks_driver") is True:
-                    self.update_interval = timedelta(seconds=60)
-                else:
-                    self.update_interval = timedelta(seconds=20)
-
-                # Log only if the update interval has changed
-                if self.update_interval != self._previous_update_interval:
-                    _LOGGER.info(
-                        "Fisker refresh rate changed from %s to %s",
-                        self._previous_update_interval,
-                        self.update_interval,
-                    )
-                    # Trigger an immediate refresh to apply the new interval
-                    await self.async_refresh()
+        if not self.breaker.allow():
+            # Also skips the refreshes requested while open, like after a button press
+            _LOGGER.debug("Fisker gateway failing, poll skipped")
+            return self._poll_failed("gateway failing, polls paused")
 
-                return retData
-        except:
-            _LOGGER.error("MyCoordinator _async_update_data failed")
-        # except ApiAuthError as err:
-        #     # Raising ConfigEntryAuthFailed will cancel future updates
-        #     # and start a config flow with SOURCE_REAUTH (async_step_reauth)
-        #     raise ConfigEntryAuthFailed from err
-        # except ApiError as err:
-        #     raise UpdateFailed(f"Error communicating with API: {err}")
+        try:
+            # Polls of all entries are spread out and rate limited by the scheduler
+            async with self.poller.async_slot(), asyncio.timeout(30):
+                retData = await async_retry(self._async_fetch_digital_twins)
+                await self._async_refresh_car_settings()
+        except (MyFiskerApiError, TimeoutError) as err:
+            self.failures += 1
+            self.breaker.record_failure()
+            reason = str(err) or type(err).__name__
+            log = _LOGGER.warning if self.failures == 1 else _LOGGER.debug
+            log("Fisker poll failed: %s", reason)
+            return self._poll_failed(reason)
+        except BaseException:
+            # Anything else, even a cancellation, counts too, or a probe ending
+            # that way would leave the breaker half open
+            self.failures += 1
+            self.breaker.record_failure()
+            raise
+
+        self.failures = 0
+        self.breaker.record_success()
+        retData = self._apply_confirmations(dict(retData), polled=True)
+        self._schedule_next_poll(retData)
+        return retData
+
+    def _poll_failed(self, reason: str) -> dict[str, dict]:
+        """Return the last digital twins received, for a poll that got none.
+
+        The entities keep their last values, snapshot_age tells how old they are.
+        Raises UpdateFailed if nothing was received yet.
+        """
+        digital_twins = self.my_fisker_api.data.get(DIGITAL_TWIN)
+        if not digital_twins:
+            self._schedule_next_poll({})
+            raise UpdateFailed(f"Error communicating with Fisker: {reason}")
+
+        retData = self._apply_confirmations(dict(digital_twins), polled=True)
+        self._schedule_next_poll({})
+        return retData
 
 
 @dataclass
@@ -178,6 +675,7 @@ class FiskerSensorEntityDescription(SensorEntityDescription):
         native_unit_of_measurement,
         value,
         format=None,
+        max_age=CADENCE_LIVE,
     ):
         super().__init__(key)
         self.key = key
@@ -188,22 +686,13 @@ class FiskerSensorEntityDescription(SensorEntityDescription):
         self.native_unit_of_measurement = native_unit_of_measurement
         self.value = value
         self.format = format
+        # Seconds the value may be served from cache, before it is looked at again
+        self.max_age = max_age
+        # Name of the car setting shown, if any
+        self.car_setting = key.replace("car_settings_", "").replace("_updated", "")
 
     def get_digital_twin_value(self, data):
         return self.value(data, self.key)
 
     def get_car_settings_value(self, data):
-        return self.findInArray(
-            data, self.key.replace("car_settings_", "").replace("_updated", "")
-        )
-
-    def findInArray(self, jsonArray: str, nameToSearch: str):
-        # Loop through the array
-        for item in jsonArray["data"]:
-            if item["name"] == nameToSearch:
-                value = item["value"]
-                name = item["name"]
-                return item
-                break
-        else:
-            return None
+        return data.get(self.car_setting)
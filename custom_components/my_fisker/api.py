@@ -1,97 +1,235 @@
 """Class to handle connections towards Fisker API servers."""
 
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
 import json
 import logging
+import math
+import time
+from typing import NamedTuple
 
 import aiohttp
 
 from .const import (
     API_TIMEOUT,
     CAR_SETTINGS,
+    COMMAND_STATUS_OK,
     DIGITAL_TWIN,
+    HANDLER_COMMAND,
+    HANDLER_TOKEN,
     PROFILES,
+    TIMEOUT_DIGITAL_TWIN,
+    TIMEOUT_PROFILES,
     TOKEN_URL,
     TRIM_EXTREME_ULTRA_BATT_CAPACITY,
     TRIM_SPORT_BATT_CAPACITY,
     WSS_URL_EU,
     WSS_URL_US,
 )
+from .connection import MyFiskerConnection, frame_vin, wait_replies
+from .exceptions import (  # noqa: F401
+    AuthenticationError,
+    CommandError,
+    MyFiskerApiError,
+    RequestConnectionError,
+    RequestDataError,
+    RequestError,
+    RequestRetryError,
+    RequestTimeoutError,
+)
+from .extractor import DigitalTwinExtractor
+from .singleflight import SingleFlight
 
 _LOGGER = logging.getLogger(__name__)
 
 headers = {"User-Agent": "MOBILE 1.0.0.0"}
 
-HasAUTH = False
-HasVIN = False
+
+class CarSetting(NamedTuple):
+    """One of the car settings, with the time it was last changed."""
+
+    value: str
+    updated: datetime | None
 
 
 class MyFiskerAPI:
     """Handle connection towards Fisker API servers."""
 
-    # Global variable to store the WebSocket connection
-    global_websocket = None
-
     vin = ""
 
-    def __init__(self, username: str, password: str, region: str):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        region: str,
+        vin: str = "",
+        session: aiohttp.ClientSession | None = None,
+        extractor: DigitalTwinExtractor | None = None,
+        base_url: str = "",
+    ):
         _LOGGER.debug("MyFiskerAPI init")
         self._username = username
         self._password = password
         self._region = region
+        self.vin = vin
+        self.vins: list[str] = []
+        self._base_url = base_url.rstrip("/")
 
         self._token = ""
         self._timeout = aiohttp.ClientTimeout(total=API_TIMEOUT)
+        self._session = session
+        self._owns_session = session is None
+        self._extractor = extractor
+        self._connection: MyFiskerConnection | None = None
+        self._push_listeners: list[Callable[[str], None]] = []
+        self.flights = SingleFlight()
+        self._snapshot_keys: dict[str, str | int] = {}
+        self._car_settings_received: dict[str, float] = {}
+        self._car_settings_missing: set[str] = set()
+        self.snapshots_unchanged = 0
         self.data = {}
 
     async def GetAuthTokenAsync(self):
         """Get the Authentification token from Fisker, is used towards the WebSocket connection."""
+        return await self.flights.run(HANDLER_TOKEN, self.__RequestAuthToken)
 
+    async def __RequestAuthToken(self):
         params = {"username": self._username, "password": self._password}
-        async with (
-            aiohttp.ClientSession() as session,
-            session.post(TOKEN_URL, data=params) as response,
-        ):
-            data = await response.json()
-
-            # Check if a key exists
-            if "accessToken" in data:
-                retVal = data["accessToken"]
-            else:
-                retVal = data["message"]
-
-            self._token = retVal
-            return self._token
+        try:
+            async with self.__GetSession().post(
+                self.__GetTokenURL(), data=params, timeout=self._timeout
+            ) as response:
+                data = await response.json()
+        except aiohttp.ClientError as err:
+            raise RequestConnectionError(f"Logging in failed: {err}") from err
+        except TimeoutError as err:
+            raise RequestTimeoutError(
+                f"Logging in took over {self._timeout.total}s"
+            ) from err
+
+        # Check if a key exists
+        if "accessToken" in data:
+            retVal = data["accessToken"]
+        else:
+            retVal = data["message"]
+
+        self._token = retVal
+        return self._token
 
     async def tokenReturn(self):
         return self._token
 
-    def GetCarSettings(self):
+    def SetAuthToken(self, token: str):
+        """Use a previously fetched token, instead of logging in."""
+        self._token = token
+
+    def GetCarSettings(self, vin: str | None = None) -> dict[str, CarSetting] | None:
+        """Get the car settings of a vehicle by name, by default the first one."""
+        vin = vin or self.vin
         try:
-            data = json.loads(self.data[CAR_SETTINGS])
-            _LOGGER.debug(data)
-            return data
-        except NameError:
-            _LOGGER.warning("Self.data['car_settings'] is not available")
+            return self.data[CAR_SETTINGS][vin]
+        except KeyError:
+            # Every car settings sensor looks them up, so tell only once
+            if vin not in self._car_settings_missing:
+                self._car_settings_missing.add(vin)
+                _LOGGER.debug("No '%s' received for %s yet", CAR_SETTINGS, vin)
             return None
 
-    async def GetDigitalTwin(self):
-        self.data[DIGITAL_TWIN] = self.flatten_json(
-            self.ParseDigitalTwinResponse(
-                await self.__GetWebsocketResponse(DIGITAL_TWIN)
+    def CarSettingsAge(self) -> float:
+        """Return the seconds since the oldest car settings arrived, infinite if any are missing."""
+        if not self.vins or not self._car_settings_received.keys() >= set(self.vins):
+            return math.inf
+        oldest = min(self._car_settings_received[vin] for vin in self.vins)
+        return time.monotonic() - oldest
+
+    async def RefreshCarSettings(self) -> dict[str, dict]:
+        """Request the car settings of all vehicles, by VIN.
+
+        The gateway sends them by itself right after verify, so they only need to
+        be requested on a connection that has been open for a while. Its frames do
+        not tell which vehicle they are about, so the vehicles are asked one at a
+        time and each reply is stored as the settings of the vehicle asked.
+        """
+        return await self.flights.run(CAR_SETTINGS, self.__RequestCarSettings)
+
+    async def __RequestCarSettings(self) -> dict[str, dict]:
+        if not self.vins:
+            await self.GetProfiles()
+
+        connection = self.__GetConnection()
+        for vin in self.vins:
+            frame = await connection.request(
+                self.CarSettingsRequest(vin), CAR_SETTINGS, vin, timeout=API_TIMEOUT
             )
-        )
+            self.__StoreCarSettings(vin, frame)
+        return self.data[CAR_SETTINGS]
+
+    async def GetDigitalTwins(self) -> dict[str, dict]:
+        """Get the flattened digital twins of all vehicles on the account, by VIN.
+
+        The requests for all vehicles are sent back to back over the one
+        connection and their replies awaited together. Before the vehicles on the
+        account are known, the VIN of the config entry is asked for right away,
+        and the profiles alongside it instead of a round trip ahead of it.
+        """
+        return await self.flights.run(DIGITAL_TWIN, self.__RequestDigitalTwins)
+
+    async def __RequestDigitalTwins(self) -> dict[str, dict]:
+        if self.vins or not self.vin:
+            if not self.vins:
+                await self.GetProfiles()
+            await self.__RequestDigitalTwinsOf(self.vins)
+            return self.data[DIGITAL_TWIN]
+
+        profiles = asyncio.ensure_future(self.GetProfiles())
+        try:
+            await self.__RequestDigitalTwinsOf([self.vin])
+        except BaseException:
+            # Only the wait is given up, the profiles are still stored once received
+            profiles.cancel()
+            raise
+        try:
+            # Answered in the same round trip, so hardly ever waited for
+            await profiles
+        except MyFiskerApiError as err:
+            _LOGGER.debug(f"Profiles not received, asking again next poll: {err}")
+        else:
+            if others := [vin for vin in self.vins if vin != self.vin]:
+                await self.__RequestDigitalTwinsOf(others)
         return self.data[DIGITAL_TWIN]
 
+    async def __RequestDigitalTwinsOf(self, vins: list[str]):
+        connection = self.__GetConnection()
+        futures = [
+            await connection.send(self.DigitalTwinRequest(vin), DIGITAL_TWIN, vin)
+            for vin in vins
+        ]
+        responses = await wait_replies(futures, DIGITAL_TWIN, TIMEOUT_DIGITAL_TWIN)
+
+        for vin, response in zip(vins, responses):
+            self.__StoreDigitalTwin(vin, response)
+
     async def GetProfiles(self):
-        self.data[PROFILES] = self.ParseProfilesResponse(
-            await self.__GetWebsocketResponse(PROFILES)
+        """Get the VINs of all vehicles on the account."""
+        return await self.flights.run(PROFILES, self.__RequestProfiles)
+
+    async def __RequestProfiles(self):
+        response = await self.__GetConnection().request(
+            self.GenerateProfilesRequest(), PROFILES, timeout=TIMEOUT_PROFILES
         )
+        self.data[PROFILES] = self.ParseProfilesResponse(response)
+        self.vins = list(self.data[PROFILES])
+        if not self.vin and self.vins:
+            self.vin = self.vins[0]
+        _LOGGER.debug(f"Auth & VIN ok - vins={self.vins}")
         return self.data[PROFILES]
 
-    def ParseDigitalTwinResponse(self, jsonMsg):
+    def ParseDigitalTwinResponse(self, data: dict):
         # _LOGGER.debug('Start ParseDigitalTwinResponse()')
-        # Parse the JSON response into a Python dictionary
-        data = json.loads(jsonMsg)
+        # The frame is already decoded by the connection
         _LOGGER.debug(data)
 
         if data["handler"] != DIGITAL_TWIN:
@@ -142,37 +280,6 @@ class MyFiskerAPI:
 
         return digital_twin
 
-    def GenerateVerifyRequest(self):
-        # _LOGGER.debug('Start GenerateVerifyRequest()')
-        data = {}
-        messageData = {}
-
-        # token = self.GetAuthToken(username, password)
-        token = self._token
-
-        data["token"] = token
-        messageData["data"] = data
-        messageData["handler"] = "verify"
-        # print (messageData)
-        return messageData
-
-    def ParseVerifyResponse(self, jsonMsg):
-        # Parse the JSON response into a Python dictionary
-        data = json.loads(jsonMsg)
-
-        if data["handler"] != "verify":
-            return "Wrong answer from websocket"
-
-        # Now you can access the items in the JSON response as you would with a Python dictionary
-        item1 = data["data"]["authenticated"]
-
-        if item1 != "true":
-            return "Not authenticated"
-
-        result = item1
-        _LOGGER.debug(result)  # Outputs: value1
-        return True
-
     def GenerateProfilesRequest(self):
         # _LOGGER.debug('Start GenerateProfilesRequest()')
         messageData = {}
@@ -185,39 +292,75 @@ class MyFiskerAPI:
         # _LOGGER.debug('Start DigitalTwinRequest()')
         data = {}
         messageData = {}
-        data["vin"] = self.vin
+        data["vin"] = vin
         messageData["data"] = data
         messageData["handler"] = DIGITAL_TWIN
         return messageData
 
-    def ParseProfilesResponse(self, jsonMsg):
+    def CarSettingsRequest(self, vin):
+        data = {}
+        messageData = {}
+        data["vin"] = vin
+        messageData["data"] = data
+        messageData["handler"] = CAR_SETTINGS
+        return messageData
+
+    @staticmethod
+    def ParseCarSettingsResponse(data: dict) -> dict[str, CarSetting]:
+        """Index the settings in a car_settings frame by name, with parsed timestamps."""
+        settings = {}
+        for item in data["data"]:
+            try:
+                updated = datetime.fromisoformat(item["updated"])
+            except (KeyError, TypeError, ValueError):
+                updated = None
+            settings[item["name"]] = CarSetting(item.get("value"), updated)
+        return settings
+
+    def ParseProfilesResponse(self, data: dict):
         # _LOGGER.debug('Start ParseProfilesResponse()')
-        # Parse the JSON response into a Python dictionary
-        data = json.loads(jsonMsg)
+        # The frame is already decoded by the connection
         # print (data)
         if data["handler"] != PROFILES:
             _LOGGER.debug("ParseProfilesResponse: Wrong answer from websocket")
             _LOGGER.debug(data)
             return "Wrong answer from websocket"
 
-        # Now you can access the items in the JSON response as you would with a Python dictionary
-        item1 = data["data"][0]["vin"]
+        # One profile per vehicle on the account
+        return [profile["vin"] for profile in data["data"]]
 
-        # Use the jsonpath expression to find the value in the data
-        result = item1
-        return result
+    async def SendCommandRequest(self, command, vin: str | None = None) -> dict:
+        """Send a remote command and return the data of the gateway's acknowledgement.
 
-    async def SendCommandRequest(self, command):
-        # _LOGGER.debug('Start SendCommandRequest()')
+        Raises CommandError if the gateway reports the command was not run.
+        """
         data = {}
         messageData = {}
-        data["vin"] = self.vin
+        data["vin"] = vin or self.vin
         data["command"] = command
         messageData["data"] = data
-        messageData["handler"] = "remote_command"
-        return await self.__SendWebsocketRequest(messageData)
+        messageData["handler"] = HANDLER_COMMAND
+        return self.ParseCommandResponse(await self.__SendWebsocketRequest(messageData))
+
+    @staticmethod
+    def ParseCommandResponse(data: dict) -> dict:
+        """Return the data of a remote_command acknowledgement, raising CommandError on a failure."""
+        ack = data.get("data") or {}
+        status = ack.get("status")
+        if status is not None and str(status).lower() not in COMMAND_STATUS_OK:
+            raise CommandError(f"Command '{ack.get('command')}' was not run: {status}")
+        return ack
+
+    def __GetTokenURL(self):
+        if self._base_url:
+            return f"{self._base_url}/auth/login"
+        return TOKEN_URL
 
     def __GetRegionURL(self):
+        # A base URL, e.g. of the gateway simulator, replaces the Fisker servers
+        if self._base_url:
+            return "ws" + self._base_url.removeprefix("http") + "/mobile"
+
         match self._region:
             case "EU":
                 return WSS_URL_EU
@@ -226,97 +369,163 @@ class MyFiskerAPI:
             case _:
                 return WSS_URL_US
 
-    async def __GetWebsocketResponse(self, responseToReturn: str):
-        HasAUTH = False
-        HasVIN = HasAUTH
-
-        wssUrl = self.__GetRegionURL()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.ws_connect(wssUrl, headers=headers) as ws:
-                await ws.send_str(json.dumps(self.GenerateVerifyRequest()))
-                while True:
-                    response = await ws.receive_str()
-                    handler = json.loads(response)["handler"]
-
-                    if handler == CAR_SETTINGS:
-                        self.data[CAR_SETTINGS] = response
-
-                    if handler == responseToReturn:
-                        try:
-                            await ws.close()
-                        except Exception as e:
-                            _LOGGER.debug(
-                                f"Error occurred while closing WebSocket: {e}"
-                            )
-                        return response
-
-                    if HasAUTH is not True:
-                        if handler == "verify":
-                            HasAUTH = (
-                                json.loads(response)["data"]["authenticated"] is True
-                            )
-                            # Send a message
-                            # _LOGGER.debug(f"Sending 'GenerateProfilesRequest'")
-                            await ws.send_str(
-                                json.dumps(self.GenerateProfilesRequest())
-                            )
-
-                    if HasAUTH is True and HasVIN is not True:
-                        if handler == PROFILES:
-                            self.vin = self.ParseProfilesResponse(response)
-                            # print (f"vin = {vin}")
-                            if self.vin != "":
-                                self.HasVIN = True
-                                # Send a message
-                                _LOGGER.debug(
-                                    f"Auth & VIN ok - Sending 'DigitalTwinRequest' to vin={self.vin}"
-                                )
-                                await ws.send_str(
-                                    json.dumps(self.DigitalTwinRequest(self.vin))
-                                )
-
-                    if HasAUTH is True and HasVIN is True:
-                        # _LOGGER.debug(f"Received message: {message}")
-                        if handler == responseToReturn:
-                            _LOGGER.error(response)
-                            try:
-                                await ws.close()
-                            except Exception as e:
-                                _LOGGER.error(
-                                    f"Error occurred while closing WebSocket: {e}"
-                                )
-
-                            return response
-
-    async def __SendWebsocketRequest(self, commandToSend: str):
-        HasAUTH = False
-        wssUrl = self.__GetRegionURL()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.ws_connect(wssUrl, headers=headers) as ws:
-                await ws.send_str(json.dumps(self.GenerateVerifyRequest()))
-                while True:
-                    response = await ws.receive_str()
-                    handler = json.loads(response)["handler"]
-
-                    if handler in (DIGITAL_TWIN, CAR_SETTINGS):
-                        try:
-                            await ws.close()
-                        except Exception as e:
-                            _LOGGER.debug(
-                                f"Error occurred while closing WebSocket: {e}"
-                            )
-                        return response
-
-                    if HasAUTH is not True:
-                        if handler == "verify":
-                            HasAUTH = (
-                                json.loads(response)["data"]["authenticated"] is True
-                            )
-                            # Send a message
-                            # _LOGGER.debug(f"Sending 'GenerateProfilesRequest'")
-                            await ws.send_str(json.dumps(commandToSend))
+    def __GetSession(self) -> aiohttp.ClientSession:
+        # Without an injected session, one is created and owned by this instance
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+        return self._session
+
+    def __GetConnection(self) -> MyFiskerConnection:
+        if self._connection is None:
+            self._connection = MyFiskerConnection(
+                self.__GetRegionURL(),
+                headers,
+                self.__GetSession(),
+                self.tokenReturn,
+            )
+            self._connection.register(CAR_SETTINGS, self.__OnCarSettingsFrame)
+            self._connection.register(DIGITAL_TWIN, self.__OnDigitalTwinFrame)
+        return self._connection
+
+    def __OnCarSettingsFrame(self, frame: dict, solicited: bool):
+        # Replies to our own requests are stored by RefreshCarSettings
+        if solicited:
+            return
+
+        # Settings not telling which vehicle they are about can only be stored if
+        # the account is known to have a single one, otherwise they are requested
+        # by VIN later
+        if not (vin := frame_vin(frame)):
+            if len(self.vins) != 1:
+                _LOGGER.debug("Ignoring '%s' frame of unknown vehicle", CAR_SETTINGS)
+                return
+            vin = self.vins[0]
+
+        if self.__StoreCarSettings(vin, frame) and self._push_listeners:
+            self.__NotifyPushListeners(CAR_SETTINGS)
+
+    def __StoreCarSettings(self, vin: str, frame: dict) -> bool:
+        """Parse and store the car settings of a vehicle, returning False if invalid."""
+        try:
+            settings = self.ParseCarSettingsResponse(frame)
+        except Exception as e:
+            _LOGGER.debug(f"Ignoring '{CAR_SETTINGS}' frame: {e}")
+            return False
+        self.data.setdefault(CAR_SETTINGS, {})[vin] = settings
+        self._car_settings_received[vin] = time.monotonic()
+        self._car_settings_missing.discard(vin)
+        return True
+
+    def __OnDigitalTwinFrame(self, frame: dict, solicited: bool):
+        # Replies to our own requests are parsed by GetDigitalTwins
+        if solicited or not self._push_listeners:
+            return
+
+        try:
+            vin = frame_vin(frame) or self.vin
+            previous = self.data.get(DIGITAL_TWIN, {}).get(vin)
+            if self.__StoreDigitalTwin(vin, frame) is previous:
+                return
+        except Exception as e:
+            _LOGGER.debug(f"Ignoring pushed '{DIGITAL_TWIN}' frame: {e}")
+            return
+
+        self.__NotifyPushListeners(DIGITAL_TWIN)
+
+    def __NotifyPushListeners(self, handler: str):
+        for listener in list(self._push_listeners):
+            listener(handler)
+
+    async def __Resubscribe(self):
+        # Fresh digital_twin requests after a reconnect restart the pushed frames
+        await self.GetDigitalTwins()
+        self.__NotifyPushListeners(DIGITAL_TWIN)
+
+    def AddPushListener(
+        self,
+        listener: Callable[[str], None],
+        hold_off: Callable[[], float] | None = None,
+    ) -> Callable[[], None]:
+        """Call listener with the handler of every frame pushed by the gateway.
+
+        While a listener is registered, the connection is kept open and re-opened
+        after a drop, not before the seconds returned by hold_off have passed.
+        Returns a function removing the listener again.
+        """
+        self._push_listeners.append(listener)
+        self.__GetConnection().set_keep_alive(self.__Resubscribe, hold_off)
+
+        def remove_listener():
+            if listener in self._push_listeners:
+                self._push_listeners.remove(listener)
+            if not self._push_listeners and self._connection is not None:
+                self._connection.set_keep_alive(None)
+
+        return remove_listener
+
+    def IsPushActive(self) -> bool:
+        """Return True while frames are pushed to the registered listeners."""
+        return (
+            bool(self._push_listeners)
+            and self._connection is not None
+            and self._connection.connected
+        )
+
+    async def __SendWebsocketRequest(self, commandToSend: dict):
+        # Answered by the gateway with a remote_command frame about the vehicle
+        connection = self.__GetConnection()
+        return await connection.request(
+            commandToSend, HANDLER_COMMAND, commandToSend["data"]["vin"]
+        )
+
+    async def CloseAsync(self):
+        """Close the WebSocket connection towards the Fisker gateway."""
+        self.flights.cancel()
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def __StoreDigitalTwin(self, vin: str, frame: dict) -> dict:
+        """Parse and store the digital twin in a frame, unless it is the stored one.
+
+        A vehicle that is asleep keeps being reported with the same snapshot. An
+        unchanged snapshot is recognised by its 'updated' timestamp, or a hash of
+        its content if it has none, and the stored digital twin is returned as is.
+        """
+        digital_twins = self.data.setdefault(DIGITAL_TWIN, {})
+        key = self.SnapshotKey(frame)
+        if (
+            key is not None
+            and vin in digital_twins
+            and self._snapshot_keys.get(vin) == key
+        ):
+            self.snapshots_unchanged += 1
+            return digital_twins[vin]
+
+        digital_twin = self.__FlattenDigitalTwin(self.ParseDigitalTwinResponse(frame))
+        digital_twins[vin] = digital_twin
+        if key is not None:
+            self._snapshot_keys[vin] = key
+        return digital_twin
+
+    @staticmethod
+    def SnapshotKey(frame: dict) -> str | int | None:
+        """Return what identifies the snapshot in a digital_twin frame, None if nothing does."""
+        data = frame.get("data")
+        if frame.get("handler") != DIGITAL_TWIN or not isinstance(data, dict):
+            return None
+        if updated := data.get("updated"):
+            return updated
+        return hash(json.dumps(data, sort_keys=True))
+
+    def __FlattenDigitalTwin(self, digital_twin: dict) -> dict:
+        if self._extractor is None:
+            return self.flatten_json(digital_twin)
+        return self._extractor.extract(digital_twin)
 
     def flatten_json(self, jsonIn):
         out = {}
@@ -335,35 +544,3 @@ class MyFiskerAPI:
 
         flatten(jsonIn)
         return out
-
-
-class MyFiskerApiError(Exception):
-    """Base exception for all MyFisker API errors"""
-
-
-class AuthenticationError(MyFiskerApiError):
-    """Authenatication failed"""
-
-
-class RequestError(MyFiskerApiError):
-    """Failed to get the results from the API"""
-
-    def __init__(self, message, error_code):
-        super().__init__(message)
-        self.error_code = error_code
-
-
-class RequestConnectionError(MyFiskerApiError):
-    """Failed to make the request to the API"""
-
-
-class RequestTimeoutError(MyFiskerApiError):
-    """Failed to get the results from the API"""
-
-
-class RequestRetryError(MyFiskerApiError):
-    """Retries too many times"""
-
-
-class RequestDataError(MyFiskerApiError):
-    """Data is not valid"""
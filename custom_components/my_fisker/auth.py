@@ -0,0 +1,124 @@
+"""Access token cache for the Fisker API."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .api import MyFiskerAPI
+from .const import DOMAIN, TOKEN_REFRESH_MARGIN, TOKEN_STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_token_expiry(token: str) -> float:
+    """Return the expiry of a JWT access token as a unix timestamp, 0 if unknown."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0
+
+
+def _token_store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(
+        hass, TOKEN_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.token", private=True
+    )
+
+
+async def async_remove_token(hass: HomeAssistant, entry_id: str):
+    """Remove the token stored for a config entry."""
+    await _token_store(hass, entry_id).async_remove()
+
+
+class MyFiskerTokenManager:
+    """Keep the access token of a MyFiskerAPI valid, logging in only when needed.
+
+    The token is reused until shortly before it expires, refreshed in the
+    background ahead of expiry and stored, so a restart does not need a login.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: MyFiskerAPI, entry_id: str):
+        self._hass = hass
+        self._api = api
+        self._store = _token_store(hass, entry_id)
+        self._lock = asyncio.Lock()
+        self._token = ""
+        self._expiry = 0.0
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+
+    @property
+    def valid(self) -> bool:
+        """Return True if the cached token is not about to expire."""
+        return bool(self._token) and time.time() < self._expiry - TOKEN_REFRESH_MARGIN
+
+    async def async_load(self):
+        """Restore the token stored by a previous run, if it is still valid."""
+        if (stored := await self._store.async_load()) is None:
+            return
+
+        self._set_token(stored.get("access_token", ""))
+        if self.valid:
+            _LOGGER.debug("Using stored Fisker access token")
+            self._api.SetAuthToken(self._token)
+            self._schedule_refresh()
+
+    async def async_get_token(self) -> str:
+        """Return a valid token, logging in if the cached one is about to expire."""
+        if self.valid:
+            return self._token
+        return await self.async_refresh()
+
+    async def async_refresh(self, force: bool = False) -> str:
+        """Log in and cache the new token. Without force, a valid token is kept."""
+        token = self._token
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self.valid and not (force and self._token == token):
+                return self._token
+
+            _LOGGER.debug("Refreshing Fisker access token")
+            self._set_token(await self._api.GetAuthTokenAsync())
+            if self._expiry:
+                await self._store.async_save({"access_token": self._token})
+            self._schedule_refresh()
+            return self._token
+
+    @callback
+    def async_shutdown(self):
+        """Cancel the scheduled background refresh."""
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    def _set_token(self, token: str):
+        self._token = token
+        self._expiry = get_token_expiry(token)
+
+    @callback
+    def _schedule_refresh(self):
+        self.async_shutdown()
+        if not self._expiry:
+            return
+
+        delay = max(self._expiry - TOKEN_REFRESH_MARGIN - time.time(), 0)
+        self._unsub_refresh = async_call_later(self._hass, delay, self._refresh_later)
+
+    @callback
+    def _refresh_later(self, _now):
+        self._unsub_refresh = None
+        self._hass.async_create_task(self._async_background_refresh())
+
+    async def _async_background_refresh(self):
+        try:
+            await self.async_refresh(force=True)
+        except Exception as err:
+            _LOGGER.warning(f"Background refresh of Fisker access token failed: {err}")
@@ -1,15 +1,18 @@
 """Platform for binary_sensor integration."""
 
+from collections.abc import Callable
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import FiskerSensorEntityDescription
 from .const import CLIMATE_CONTROL_STEERING_WHEEL_HEAT, DOMAIN, DOOR_LOCK, GEAR_IN_PARK
-from .entities_binary_sensor import BINARY_SENSORS
+from .registry import REGISTRY
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,18 +28,37 @@ async def async_setup_entry(
 
     entities: list[FiskerSensor] = []
 
-    # for sensor in SENSORS:
-    for idx in enumerate(coordinator.data):
-        sens = get_sensor_by_key(idx[1])
-        if sens is None:
-            _LOGGER.warning(idx[1])
-        else:
-            entities.append(FiskerSensor(coordinator, idx, sens, my_Fisker_data))
+    # One set of sensors per vehicle, the context is the (VIN, key) they show
+    for vin, digital_twin in coordinator.data.items():
+        for key in digital_twin:
+            sens = REGISTRY.get(Platform.BINARY_SENSOR, key)
+            if sens is not None:
+                entities.append(
+                    FiskerSensor(coordinator, (vin, key), sens, my_Fisker_data)
+                )
 
     # Add entities to Home Assistant
     async_add_entities(entities)
 
 
+def compile_state_handler(coordinator, idx) -> Callable[[], Any]:
+    """Return a function returning the state of a binary sensor.
+
+    The map of the value to the state is chosen here, once, so an update is a
+    single call. The function raises KeyError while the value is not available.
+    """
+    vin, key = idx
+    if "doors_" in key:
+        states = DOOR_LOCK
+    elif "gear_in_park" in key:
+        states = GEAR_IN_PARK
+    elif "climate_control_steering_wheel_heat" in key:
+        states = CLIMATE_CONTROL_STEERING_WHEEL_HEAT
+    else:
+        return lambda: coordinator.data[vin][key]
+    return lambda: states[coordinator.data[vin][key]][0]
+
+
 class FiskerSensor(CoordinatorEntity):
     """Sensor used by all Fisker entities, inherits from CoordinatorEntity."""
 
@@ -46,11 +68,15 @@ class FiskerSensor(CoordinatorEntity):
         self.idx = idx
         self._data = client
         self._coordinator = coordinator
+        self.vin = idx[0]
         self.entity_description = sensor
-        self._attr_unique_id = f"{self._coordinator.data['vin']}_{sensor.key}"
-        self._attr_name = f"{self._coordinator._alias} {sensor.name}"
+        self._attr_unique_id = f"{self.vin}_{sensor.key}"
+        self._attr_name = f"{self._coordinator.vehicle_name(self.vin)} {sensor.name}"
 
         _LOGGER.info(self._attr_unique_id)
+        self._state = compile_state_handler(coordinator, idx)
+        # Added after the first refresh, so show its data without waiting for the next
+        self._update_state()
 
         # if "climate_control_steering_wheel_heat" in self.entity_description.key:
         # self.options = LIST_CLIMATE_CONTROL_STEERING_WHEEL_HEAT
@@ -64,11 +90,11 @@ class FiskerSensor(CoordinatorEntity):
         return {
             "identifiers": {
                 # Unique identifiers within a specific domain
-                (DOMAIN, self._coordinator.data["vin"])
+                (DOMAIN, self.vin)
             },
             "manufacturer": "Fisker inc.",
             "model": "Fisker (Ocean)",
-            "name": self._coordinator._alias,
+            "name": self._coordinator.vehicle_name(self.vin),
         }
 
     @property
@@ -78,23 +104,18 @@ class FiskerSensor(CoordinatorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-
-        value = self._coordinator.data[self.idx[1]]
-
-        if "doors_" in self.entity_description.key:
-            self._attr_state = DOOR_LOCK[value][0]
-        elif "gear_in_park" in self.entity_description.key:
-            self._attr_state = GEAR_IN_PARK[value][0]
-        elif "climate_control_steering_wheel_heat" in self.entity_description.key:
-            self._attr_state = CLIMATE_CONTROL_STEERING_WHEEL_HEAT[value][0]
-        else:
-            self._attr_state = value
-
-        self._attr_available = True
+        self._update_state()
         # self._attr_is_on = True
 
         self.async_write_ha_state()
 
+    def _update_state(self):
+        try:
+            self._attr_state = self._state()
+            self._attr_available = True
+        except (KeyError, TypeError):
+            self._attr_available = False
+
     @property
     def should_poll(self):
         return False
@@ -106,11 +127,3 @@ class FiskerSensor(CoordinatorEntity):
         except (KeyError, ValueError):
             return None
         return state
-
-
-# Get an item by its key
-def get_sensor_by_key(key):
-    for sensor in BINARY_SENSORS:
-        if sensor.key == key:
-            return sensor
-    return None
@@ -6,14 +6,14 @@ import logging
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import FiskerButtonEntityDescription, MyFiskerCoordinator
-from .api import MyFiskerAPI
 from .const import DOMAIN
-from .entities_button import BUTTON_ENTITIES
+from .registry import REGISTRY
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,15 +23,17 @@ class FiskerButton(ButtonEntity):
         self,
         coordinator: MyFiskerCoordinator,
         description: FiskerButtonEntityDescription,
+        vin: str,
         # device_info: DeviceInfo,
     ) -> None:
         self.entity_description = description
         self.coordinator: MyFiskerCoordinator = coordinator
+        self.vin = vin
         self._state = 0
-        self._attr_unique_id = (
-            f"{self.coordinator._coordinator.data['vin']}_{description.key}"
+        self._attr_unique_id = f"{vin}_{description.key}"
+        self._attr_name = (
+            f"{self.coordinator._coordinator.vehicle_name(vin)} {description.name}"
         )
-        self._attr_name = f"{self.coordinator._coordinator._alias} {description.name}"
 
     @property
     def state(self):
@@ -50,16 +52,21 @@ class FiskerButton(ButtonEntity):
         """Press the button."""
         _LOGGER.debug("Press %s", self.entity_description.key)
 
-        api: MyFiskerAPI = self.coordinator._coordinator.my_fisker_api
+        coordinator: MyFiskerCoordinator = self.coordinator._coordinator
 
         try:
-            await api.SendCommandRequest(self.entity_description.key)
+            ack = await coordinator.commands.async_send(
+                self.vin, self.entity_description.key
+            )
         except Exception as exc:
             raise HomeAssistantError(
                 f"Running command '{self.entity_description.key}' failed"
             ) from exc
 
-        await self.coordinator._coordinator.async_request_refresh()
+        # Coalesced presses are acknowledged with the command sent in their place
+        coordinator.async_expect_command(
+            self.vin, ack.get("command", self.entity_description.key)
+        )
 
 
 async def async_setup_entry(
@@ -71,7 +78,8 @@ async def async_setup_entry(
 
     entities: list[FiskerButton] = []
 
-    for but in BUTTON_ENTITIES:
-        entities.append(FiskerButton(coordinator, but))
+    for vin in coordinator._coordinator.data:
+        for but in REGISTRY.descriptions(Platform.BUTTON):
+            entities.append(FiskerButton(coordinator, but, vin))
 
     async_add_entities(entities, True)
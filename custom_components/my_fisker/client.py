@@ -0,0 +1,85 @@
+"""Shared HTTP/WebSocket client used by all My Fisker config entries and flows."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .shared import async_get_shared
+
+DATA_CLIENT = "client"
+
+
+@dataclass
+class MyFiskerClientStats:
+    """Counters showing how well connections are reused."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the counters as a dictionary."""
+        return asdict(self)
+
+
+class MyFiskerClient:
+    """Pooled client session built on Home Assistant's shared connector.
+
+    DNS results, TCP connections and TLS sessions are pooled by the connector,
+    so the login and every WebSocket connect after the first skip most of the
+    handshake.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.stats = MyFiskerClientStats()
+        # Not cleaned up with the entry that happens to create it, but once the
+        # last one is unloaded
+        self.session: aiohttp.ClientSession = async_create_clientsession(
+            hass, auto_cleanup=False, trace_configs=[self._create_trace_config()]
+        )
+
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        stats = self.stats
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            stats.requests += 1
+
+        async def on_connection_create_end(session, context, params):
+            stats.connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            stats.connections_reused += 1
+
+        async def on_dns_cache_hit(session, context, params):
+            stats.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, context, params):
+            stats.dns_cache_misses += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+
+@callback
+def async_get_client(hass: HomeAssistant) -> MyFiskerClient:
+    """Return the client shared by all config entries, creating it on first use."""
+    shared = async_get_shared(hass)
+
+    def create() -> MyFiskerClient:
+        client = MyFiskerClient(hass)
+        shared.async_on_teardown(client.session.detach)
+        return client
+
+    return shared.async_get(DATA_CLIENT, create)
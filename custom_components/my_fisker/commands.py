@@ -0,0 +1,195 @@
+"""Queue of the remote commands sent to the vehicles of one config entry."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+import logging
+import time
+from typing import Any
+
+from .api import MyFiskerAPI
+from .const import (
+    COMMAND_COALESCE_DELAY,
+    COMMAND_DOORS_LOCK,
+    COMMAND_DOORS_UNLOCK,
+    COMMAND_TIMEOUT,
+    COMMAND_TRUNK_CLOSE,
+    COMMAND_TRUNK_OPEN,
+)
+from .exceptions import RequestTimeoutError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Commands undoing each other; of rapid presses in a group only the last counts
+COMMAND_GROUPS = {
+    COMMAND_DOORS_LOCK: "doors",
+    COMMAND_DOORS_UNLOCK: "doors",
+    COMMAND_TRUNK_OPEN: "trunk",
+    COMMAND_TRUNK_CLOSE: "trunk",
+}
+
+
+# Flattened digital twin values expected once a command has been run
+COMMAND_EFFECTS: dict[str, dict[str, Any]] = {
+    COMMAND_DOORS_LOCK: {"door_locks_all": True, "door_locks_driver": True},
+    COMMAND_DOORS_UNLOCK: {"door_locks_all": False, "door_locks_driver": False},
+    COMMAND_TRUNK_OPEN: {"doors_trunk": True},
+    COMMAND_TRUNK_CLOSE: {"doors_trunk": False},
+}
+
+
+@dataclass
+class PendingConfirmation:
+    """The state a vehicle is expected to report after a command.
+
+    The expected values are shown on top of the reported digital twin until a
+    snapshot taken after the command confirms or contradicts them, or until
+    the polls allowed for that run out.
+    """
+
+    command: str
+    values: dict[str, Any]
+    sent: datetime
+    polls_left: int
+    _base: dict | None = field(default=None, repr=False)
+    _overlaid: dict | None = field(default=None, repr=False)
+
+    def resolve(self, digital_twin: dict, updated: datetime | None) -> bool:
+        """Return True if the digital twin confirms or contradicts the expected values."""
+        if self.values and all(
+            digital_twin.get(key) == value for key, value in self.values.items()
+        ):
+            _LOGGER.debug("Command '%s' confirmed by the vehicle", self.command)
+            return True
+        if updated is not None and updated > self.sent:
+            _LOGGER.debug("Command '%s' contradicted by the vehicle", self.command)
+            return True
+        return False
+
+    def overlay(self, digital_twin: dict) -> dict:
+        """Return the digital twin with the expected values applied."""
+        # The same snapshot gets the same object, so it is still seen as unchanged
+        if digital_twin is not self._base:
+            self._base = digital_twin
+            self._overlaid = {**digital_twin, **self.values}
+        return self._overlaid
+
+
+@dataclass
+class CommandStats:
+    """Counters of the commands sent and the time until they were acknowledged."""
+
+    sent: int = 0
+    acknowledged: int = 0
+    failed: int = 0
+    coalesced: int = 0
+    latency_last: float = 0.0
+    latency_max: float = 0.0
+    latency_total: float = 0.0
+    latency_by_command: dict[str, float] = field(default_factory=dict)
+
+    def add(self, command: str, latency: float):
+        """Count a command acknowledged latency seconds after it was sent."""
+        self.acknowledged += 1
+        self.latency_last = latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_total += latency
+        self.latency_by_command[command] = latency
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dictionary, with the average latency."""
+        out = asdict(self)
+        out["latency_avg"] = (
+            self.latency_total / self.acknowledged if self.acknowledged else 0.0
+        )
+        return out
+
+
+class _QueuedCommand:
+    """A command waiting to be sent, shared by all presses coalesced into it."""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class CommandQueue:
+    """Send remote commands over the connection of the API, one at a time per vehicle.
+
+    A command waits a short moment before it is sent. Presses of the same
+    command meanwhile join it, and a contradicting press, like doors_unlock
+    after doors_lock, replaces it. A command only counts as run once the
+    gateway acknowledges it with a remote_command frame.
+    """
+
+    def __init__(
+        self,
+        api: MyFiskerAPI,
+        coalesce_delay: float = COMMAND_COALESCE_DELAY,
+        timeout: float = COMMAND_TIMEOUT,
+    ):
+        self._api = api
+        self._coalesce_delay = coalesce_delay
+        self._timeout = timeout
+        self._queued: dict[str, dict[str, _QueuedCommand]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.stats = CommandStats()
+
+    async def async_send(self, vin: str, command: str) -> dict:
+        """Send a command to a vehicle and return the data of its acknowledgement.
+
+        If the press was coalesced, the acknowledgement is of the command that
+        was sent in its place.
+        """
+        group = COMMAND_GROUPS.get(command, command)
+        queued_by_group = self._queued.setdefault(vin, {})
+
+        if (queued := queued_by_group.get(group)) is not None:
+            if queued.command != command:
+                _LOGGER.debug("Command '%s' replaces '%s'", command, queued.command)
+                queued.command = command
+            self.stats.coalesced += 1
+            return await asyncio.shield(queued.future)
+
+        queued = queued_by_group[group] = _QueuedCommand(command)
+        try:
+            await asyncio.sleep(self._coalesce_delay)
+            async with self._locks.setdefault(vin, asyncio.Lock()):
+                # Presses from here on make up the next command
+                del queued_by_group[group]
+                result = await self._async_execute(vin, queued.command)
+        except BaseException as err:
+            if queued_by_group.get(group) is queued:
+                del queued_by_group[group]
+            if isinstance(err, asyncio.CancelledError):
+                queued.future.cancel()
+            else:
+                queued.future.set_exception(err)
+                # Only re-raised to the presses that joined, if any
+                queued.future.exception()
+            raise
+
+        queued.future.set_result(result)
+        return result
+
+    async def _async_execute(self, vin: str, command: str) -> dict:
+        self.stats.sent += 1
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self._timeout):
+                ack = await self._api.SendCommandRequest(command, vin)
+        except TimeoutError as err:
+            self.stats.failed += 1
+            raise RequestTimeoutError(
+                f"Command '{command}' was not acknowledged within {self._timeout}s"
+            ) from err
+        except Exception:
+            self.stats.failed += 1
+            raise
+
+        latency = time.monotonic() - start
+        self.stats.add(command, latency)
+        _LOGGER.debug("Command '%s' acknowledged after %.3fs", command, latency)
+        return ack
@@ -13,8 +13,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-# from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .api import MyFiskerAPI
+from .client import async_get_client
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -33,25 +33,36 @@ STEP_ALIAS_DATA_SCHEMA = vol.Schema(
 )
 
 
-async def validate_login(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+async def validate_login(hass: HomeAssistant, data: dict[str, Any]) -> list[str]:
     """Validate the user input allows us to connect. Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user."""
 
-    api = MyFiskerAPI(data[CONF_USERNAME], data[CONF_PASSWORD], data[CONF_REGION])
+    api = MyFiskerAPI(
+        data[CONF_USERNAME],
+        data[CONF_PASSWORD],
+        data[CONF_REGION],
+        session=async_get_client(hass).session,
+    )
 
     try:
-        res = await api.GetAuthTokenAsync()
-        if len(res) < 50:
+        try:
+            res = await api.GetAuthTokenAsync()
+            if len(res) < 50:
+                raise InvalidAuth
+        except:
             raise InvalidAuth
-    except:
-        raise InvalidAuth
 
-    try:
-        vin = await api.GetProfiles()
-    except:
-        raise CannotConnect
+        try:
+            vins = await api.GetProfiles()
+            if not vins:
+                raise CannotConnect
+        except:
+            raise CannotConnect
+    finally:
+        await api.CloseAsync()
 
     # Return info that you want to store in the config entry.
-    return vin
+    # All vehicles on the account are set up, the first one names the entry
+    return vins
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -67,9 +78,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
                 self._userInput = user_input
-                self._userInput["vin"] = await validate_login(
-                    self.hass, self._userInput
-                )
+                self._vins = await validate_login(self.hass, self._userInput)
+                self._userInput["vin"] = self._vins[0]
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidAuth:
@@ -98,7 +108,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
             else:
                 return self.async_create_entry(
-                    title=f"{self._userInput[CONF_ALIAS]}  ({self._userInput['vin']})",
+                    title=f"{self._userInput[CONF_ALIAS]}  ({', '.join(self._vins)})",
                     data=self._userInput,
                 )
 
@@ -0,0 +1,360 @@
+"""Persistent WebSocket connection towards the Fisker gateway."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+import json
+import logging
+
+import aiohttp
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from .const import (
+    HANDLER_VERIFY,
+    RECONNECT_DELAY_MAX,
+    RECONNECT_DELAY_MIN,
+    TIMEOUT_CONNECT,
+    TIMEOUT_VERIFY,
+)
+from .exceptions import (
+    AuthenticationError,
+    RequestConnectionError,
+    RequestTimeoutError,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionState(StrEnum):
+    """Protocol state of the gateway connection."""
+
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    VERIFYING = "verifying"
+    READY = "ready"
+
+
+FrameCallback = Callable[[dict, bool], None]
+
+
+def frame_vin(frame: dict) -> str | None:
+    """Return the VIN a frame is about, None if it does not tell."""
+    if isinstance(data := frame.get("data"), dict) and "vin" in data:
+        return data["vin"]
+    return frame.get("vin")
+
+
+async def wait_replies(
+    futures: list[asyncio.Future], handler: str, timeout: float | None
+) -> list[dict]:
+    """Return the replies to requests sent together, once all have arrived.
+
+    Raises RequestTimeoutError if they have not all arrived within timeout
+    seconds, the requests are then given up.
+    """
+    try:
+        async with asyncio.timeout(timeout):
+            return await asyncio.gather(*futures)
+    except TimeoutError as err:
+        raise RequestTimeoutError(f"No '{handler}' reply within {timeout}s") from err
+
+
+class MyFiskerConnection:
+    """Long-lived, verified WebSocket connection shared by all requests of a MyFiskerAPI.
+
+    The socket is opened on first use, kept open between polls and re-opened on
+    the next request if the gateway drops it. Requests are written right after
+    the verify request without waiting for its reply, and replies are matched to
+    their requests by `handler` and, for requests about one vehicle, by VIN. So
+    the digital twins of several vehicles can be requested at once.
+
+    Every frame is decoded once and the decoded frame is routed to the callbacks
+    registered for its handler and to the requests waiting for it.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: dict,
+        session: aiohttp.ClientSession,
+        get_token: Callable[[], Awaitable[str]],
+        connect_timeout: float = TIMEOUT_CONNECT,
+        verify_timeout: float = TIMEOUT_VERIFY,
+    ):
+        self._url = url
+        self._headers = headers
+        self._session = session
+        self._get_token = get_token
+        self._connect_timeout = connect_timeout
+        self._verify_timeout = verify_timeout
+        self._routes: dict[str, list[FrameCallback]] = {}
+
+        self.state = ConnectionState.DISCONNECTED
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._reader: asyncio.Task | None = None
+        self._connect_lock = asyncio.Lock()
+        self._waiters: dict[str, list[tuple[str | None, asyncio.Future]]] = {}
+        self._on_reconnect: Callable[[], Awaitable[None]] | None = None
+        self._hold_off: Callable[[], float] | None = None
+        self._reconnect_task: asyncio.Task | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the socket is open, verified or not."""
+        return (
+            self.state in (ConnectionState.VERIFYING, ConnectionState.READY)
+            and self._ws is not None
+            and not self._ws.closed
+        )
+
+    @property
+    def keep_alive(self) -> bool:
+        """Return True if the connection is re-opened by itself after a drop."""
+        return self._on_reconnect is not None
+
+    def set_keep_alive(
+        self,
+        on_reconnect: Callable[[], Awaitable[None]] | None,
+        hold_off: Callable[[], float] | None = None,
+    ):
+        """Re-open the socket by itself after a drop and call on_reconnect once open.
+
+        Used for push mode, where frames must keep arriving without any polls.
+        While hold_off returns a number of seconds, like while the polls are
+        paused, no attempt is made before they have passed. Pass None to go
+        back to re-opening on the next request only.
+        """
+        self._on_reconnect = on_reconnect
+        self._hold_off = hold_off
+
+    def register(self, handler: str, frame_callback: FrameCallback):
+        """Call frame_callback with every decoded frame of the handler.
+
+        The second argument tells if a request was waiting for the frame.
+        """
+        self._routes.setdefault(handler, []).append(frame_callback)
+
+    async def request(
+        self,
+        message: dict,
+        handlers: str | tuple[str, ...],
+        vin: str | None = None,
+        timeout: float | None = None,
+    ) -> dict:
+        """Send a message and return the first frame answered by one of the handlers.
+
+        With a VIN, only a frame about that vehicle is taken as the answer, or one
+        not telling which vehicle it is about if this is the oldest request left.
+        Raises RequestTimeoutError if none arrives within timeout seconds.
+        """
+        future = await self.send(message, handlers, vin)
+        (reply,) = await wait_replies([future], message["handler"], timeout)
+        return reply
+
+    async def send(
+        self, message: dict, handlers: str | tuple[str, ...], vin: str | None = None
+    ) -> asyncio.Future:
+        """Send a message and return a future for the reply, without waiting for it.
+
+        Several requests can be sent back to back this way and awaited afterwards,
+        so they share a single round trip to the gateway.
+        """
+        if isinstance(handlers, str):
+            handlers = (handlers,)
+
+        await self.connect()
+
+        future = asyncio.get_running_loop().create_future()
+        for handler in handlers:
+            self._waiters.setdefault(handler, []).append((vin, future))
+        future.add_done_callback(lambda f: self._remove_waiter(f, handlers))
+
+        try:
+            await self._ws.send_str(json.dumps(message))
+        except Exception as err:
+            if not future.done():
+                future.set_exception(
+                    RequestConnectionError(f"Sending '{handlers[0]}' failed: {err}")
+                )
+        return future
+
+    async def connect(self):
+        """Open the socket and send the verify request, unless it is already open."""
+        async with self._connect_lock:
+            if self.connected:
+                return
+
+            await self._close_socket()
+
+            _LOGGER.debug("Opening WebSocket connection to %s", self._url)
+            self.state = ConnectionState.CONNECTING
+            ws = None
+            try:
+                async with asyncio.timeout(self._connect_timeout):
+                    ws = await self._session.ws_connect(
+                        self._url, headers=self._headers
+                    )
+
+                token = await self._get_token()
+                await ws.send_str(
+                    json.dumps({"handler": HANDLER_VERIFY, "data": {"token": token}})
+                )
+            except BaseException as err:
+                self.state = ConnectionState.DISCONNECTED
+                if ws is not None:
+                    await ws.close()
+                if isinstance(err, aiohttp.ClientError):
+                    raise RequestConnectionError(
+                        f"Connecting to {self._url} failed: {err}"
+                    ) from err
+                if isinstance(err, TimeoutError):
+                    raise RequestTimeoutError(
+                        f"Connecting to {self._url} took over {self._connect_timeout}s"
+                    ) from err
+                raise
+
+            self._ws = ws
+            self.state = ConnectionState.VERIFYING
+            self._reader = asyncio.create_task(self._read_loop(ws))
+
+    async def close(self):
+        """Close the socket, the session is left open for its owner."""
+        self._on_reconnect = None
+        self._hold_off = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        async with self._connect_lock:
+            await self._close_socket()
+
+    async def _close_socket(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+        if self._ws is not None:
+            try:
+                await self._ws.close()
+            except Exception as e:
+                _LOGGER.debug(f"Error occurred while closing WebSocket: {e}")
+            self._ws = None
+        self.state = ConnectionState.DISCONNECTED
+        self._fail_waiters(RequestConnectionError("WebSocket connection closed"))
+
+    async def _read_loop(self, ws: aiohttp.ClientWebSocketResponse):
+        error: Exception = RequestConnectionError("WebSocket connection dropped")
+        try:
+            # Requests sent meanwhile fail with the connection if verify is not answered
+            async with asyncio.timeout(self._verify_timeout) as verify_deadline:
+                async for msg in ws:
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        continue
+                    # A single bad frame is dropped, the connection stays up
+                    try:
+                        frame = json_loads(msg.data)
+                        handler = frame["handler"]
+                    except (ValueError, KeyError, TypeError) as err:
+                        _LOGGER.debug("Ignoring malformed WebSocket frame: %r", err)
+                        continue
+
+                    if handler == HANDLER_VERIFY:
+                        if not self._is_authenticated(frame):
+                            error = AuthenticationError("WebSocket verify was rejected")
+                            break
+                        self.state = ConnectionState.READY
+                        verify_deadline.reschedule(None)
+                        _LOGGER.debug("WebSocket connection verified")
+                        continue
+
+                    self._dispatch(handler, frame)
+        except asyncio.CancelledError:
+            raise
+        except TimeoutError:
+            error = RequestTimeoutError(
+                f"WebSocket verify not answered within {self._verify_timeout}s"
+            )
+        except Exception as e:
+            _LOGGER.debug(f"WebSocket reader stopped: {e}")
+
+        _LOGGER.debug("WebSocket connection closed: %s", error)
+        try:
+            await ws.close()
+        except Exception:
+            pass
+        if self._ws is ws:
+            self._ws = None
+            self._reader = None
+            self.state = ConnectionState.DISCONNECTED
+            self._fail_waiters(error)
+            if self.keep_alive and self._reconnect_task is None:
+                self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        delay = RECONNECT_DELAY_MIN
+        try:
+            while self.keep_alive:
+                await asyncio.sleep(delay)
+                while self._hold_off is not None and (hold := self._hold_off()) > 0:
+                    _LOGGER.debug("Re-opening WebSocket connection in %.0fs", hold)
+                    await asyncio.sleep(hold)
+                if not self.keep_alive:
+                    return
+                try:
+                    await self.connect()
+                    await self._on_reconnect()
+                    _LOGGER.debug("WebSocket connection re-opened")
+                    return
+                except Exception as err:
+                    _LOGGER.debug(f"Re-opening WebSocket connection failed: {err}")
+                    delay = min(delay * 2, RECONNECT_DELAY_MAX)
+        finally:
+            self._reconnect_task = None
+
+    @staticmethod
+    def _is_authenticated(frame: dict) -> bool:
+        data = frame.get("data")
+        return isinstance(data, dict) and data.get("authenticated") in (True, "true")
+
+    def _dispatch(self, handler: str, frame: dict):
+        waiters = []
+        if pending := self._waiters.pop(handler, None):
+            vin = frame_vin(frame)
+            remaining = []
+            for wanted, future in pending:
+                if future.done():
+                    continue
+                if wanted is None or wanted == vin:
+                    waiters.append(future)
+                else:
+                    remaining.append((wanted, future))
+            # A frame not telling its vehicle answers only the oldest request for one
+            if vin is None and not waiters and remaining:
+                waiters.append(remaining.pop(0)[1])
+            if remaining:
+                self._waiters[handler] = remaining
+
+        for frame_callback in self._routes.get(handler, ()):
+            try:
+                frame_callback(frame, bool(waiters))
+            except (ValueError, KeyError, TypeError) as err:
+                _LOGGER.debug("Ignoring malformed '%s' frame: %r", handler, err)
+
+        for future in waiters:
+            future.set_result(frame)
+
+    def _remove_waiter(self, future: asyncio.Future, handlers: tuple[str, ...]):
+        for handler in handlers:
+            if waiters := self._waiters.get(handler):
+                waiters[:] = [w for w in waiters if w[1] is not future]
+
+    def _fail_waiters(self, exc: Exception):
+        waiters, self._waiters = self._waiters, {}
+        for futures in waiters.values():
+            for _, future in futures:
+                if not future.done():
+                    future.set_exception(exc)
@@ -6,18 +6,61 @@ MANUCFACTURER = "Fisker inc."
 MODEL = "Fisker (Ocean)"
 
 API_TIMEOUT = 10
+# Deadlines of the phases of a poll, in seconds
+TIMEOUT_CONNECT = 10
+TIMEOUT_VERIFY = 10
+TIMEOUT_PROFILES = 10
+TIMEOUT_DIGITAL_TWIN = 15
+TOKEN_REFRESH_MARGIN = 300
+TOKEN_STORAGE_VERSION = 1
+PUSH_FALLBACK_INTERVAL = 300
+POLL_ACTIVE = 20
+POLL_CHARGING = 30
+POLL_PARKED = 60
+POLL_MAX = 1800
+POLL_ASLEEP_AFTER = 600
+RECONNECT_DELAY_MIN = 5
+RECONNECT_DELAY_MAX = 300
+RETRY_ATTEMPTS = 3
+RETRY_DELAY_MIN = 1
+RETRY_DELAY_MAX = 8
+BREAKER_THRESHOLD = 5
+BREAKER_RESET_MIN = 60
+BREAKER_RESET_MAX = 1800
+BREAKER_JITTER = 0.1
+SCHEDULER_MAX_CONCURRENT = 4
+SCHEDULER_RATE = 2
+SCHEDULER_BURST = 5
+SCHEDULER_JITTER = 0.1
 DEFAULT_SCAN_INTERVAL = 30
 
+# How old the value of an entity may get, in seconds, before it is refreshed
+CADENCE_LIVE = 0
+CADENCE_STATIC = 4 * 3600
+
+# Optional config entry key pointing the integration at another gateway, e.g. the simulator
+CONF_BASE_URL = "base_url"
+
 TOKEN_URL = "https://auth.fiskerdps.com/auth/login"
 WSS_URL_EU = "wss://gw.cec-euprd.fiskerinc.com/mobile"
 WSS_URL_US = "wss://gw.cec-prd.fiskerinc.com/mobile"
 
+HANDLER_VERIFY = "verify"
 HANDLER_COMMAND = "remote_command"
+# Not a frame, the login over HTTP, deduplicated like the requests
+HANDLER_TOKEN = "token"
 COMMAND_DOORS_UNLOCK = "doors_unlock"
 COMMAND_DOORS_LOCK = "doors_lock"
 COMMAND_TRUNK_OPEN = "trunk_open"
 COMMAND_TRUNK_CLOSE = "trunk_close"
 COMMAND_CALIFORNIA_MODE = "california_mode"
+COMMAND_STATUS_OK = ("ok", "success")
+COMMAND_TIMEOUT = 15
+# Presses of the same button group within this many seconds are sent as one
+COMMAND_COALESCE_DELAY = 0.5
+# Polls until the vehicle reports the state expected after a command
+COMMAND_BURST_INTERVAL = 5
+COMMAND_BURST_POLLS = 6
 
 TRIM_EXTREME_ULTRA_BATT_CAPACITY = 113
 TRIM_SPORT_BATT_CAPACITY = 80
@@ -25,6 +68,8 @@ TRIM_SPORT_BATT_CAPACITY = 80
 CAR_SETTINGS = "car_settings"
 DIGITAL_TWIN = "digital_twin"
 PROFILES = "profiles"
+TRIPSTAT = "tripstat"
+CHARGESTAT = "chargestat"
 
 LIST_CLIMATE_CONTROL_SEAT_HEAT = ["Unknown", "High", "Medium", "Low", "Off"]
 LIST_CLIMATE_CONTROL_STEERING_WHEEL_HEAT = ["Unknown", "Off", "On"]
@@ -0,0 +1,43 @@
+"""Diagnostics support for My Fisker."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import MyFiskerCoordinator
+from .client import async_get_client
+from .const import DOMAIN
+from .scheduler import async_get_scheduler
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: MyFiskerCoordinator = hass.data[DOMAIN][entry.entry_id]._coordinator
+
+    return {
+        "client": async_get_client(hass).stats.as_dict(),
+        "state_writes": {
+            "issued": coordinator.writes_issued,
+            "suppressed": coordinator.writes_suppressed,
+        },
+        "snapshots": {
+            "unchanged": coordinator.my_fisker_api.snapshots_unchanged,
+            "age": {
+                vin: coordinator.snapshot_age(vin) for vin in coordinator.data or {}
+            },
+        },
+        "requests": coordinator.my_fisker_api.flights.as_dict(),
+        "commands": coordinator.commands.stats.as_dict(),
+        "breaker": coordinator.breaker.as_dict(),
+        "scheduler": async_get_scheduler(hass).as_dict(),
+        "polls": {
+            **coordinator.poller.stats.as_dict(),
+            "interval": coordinator.update_interval.total_seconds(),
+            "failures": coordinator.failures,
+        },
+    }
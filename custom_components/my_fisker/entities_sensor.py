@@ -11,6 +11,7 @@ from homeassistant.const import (
 )
 
 from . import FiskerSensorEntityDescription
+from .const import CADENCE_STATIC
 
 SENSORS_DIGITAL_TWIN: tuple[SensorEntityDescription, ...] = (
     FiskerSensorEntityDescription(
@@ -132,6 +133,7 @@ SENSORS_DIGITAL_TWIN: tuple[SensorEntityDescription, ...] = (
         device_class=None,
         native_unit_of_measurement=None,
         value=lambda data, key: data[key],
+        max_age=CADENCE_STATIC,
     ),
     FiskerSensorEntityDescription(
         key="location_altitude",
@@ -164,6 +166,7 @@ SENSORS_DIGITAL_TWIN: tuple[SensorEntityDescription, ...] = (
         device_class=None,
         native_unit_of_measurement=None,
         value=lambda data, key: data[key],
+        max_age=CADENCE_STATIC,
     ),
     FiskerSensorEntityDescription(
         key="updated",
@@ -189,6 +192,7 @@ SENSORS_DIGITAL_TWIN: tuple[SensorEntityDescription, ...] = (
         device_class=None,
         native_unit_of_measurement=None,
         value=lambda data, key: data[key],
+        max_age=CADENCE_STATIC,
     ),
     FiskerSensorEntityDescription(
         key="windows_left_front",
@@ -264,6 +268,7 @@ SENSORS_CAR_SETTINGS: tuple[SensorEntityDescription, ...] = (
         device_class=None,
         native_unit_of_measurement=None,
         value=lambda data, key: data[key],
+        max_age=CADENCE_STATIC,
     ),
     FiskerSensorEntityDescription(
         key="car_settings_os_version_updated",
@@ -273,6 +278,7 @@ SENSORS_CAR_SETTINGS: tuple[SensorEntityDescription, ...] = (
         native_unit_of_measurement=None,
         value=lambda data, key: data[key],
         format="%Y-%m-%d %H:%M",
+        max_age=CADENCE_STATIC,
     ),
     FiskerSensorEntityDescription(
         key="car_settings_BODY_COLOR",
@@ -281,6 +287,7 @@ SENSORS_CAR_SETTINGS: tuple[SensorEntityDescription, ...] = (
         device_class=None,
         native_unit_of_measurement=None,
         value=lambda data, key: data[key],
+        max_age=CADENCE_STATIC,
     ),
     FiskerSensorEntityDescription(
         key="car_settings_DELIVERY_DESTINATION",
@@ -289,6 +296,7 @@ SENSORS_CAR_SETTINGS: tuple[SensorEntityDescription, ...] = (
         device_class=None,
         native_unit_of_measurement=None,
         value=lambda data, key: data[key],
+        max_age=CADENCE_STATIC,
     ),
 )
 
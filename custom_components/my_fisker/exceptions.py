@@ -0,0 +1,37 @@
+"""Exceptions raised by the My Fisker API."""
+
+
+class MyFiskerApiError(Exception):
+    """Base exception for all MyFisker API errors"""
+
+
+class AuthenticationError(MyFiskerApiError):
+    """Authenatication failed"""
+
+
+class RequestError(MyFiskerApiError):
+    """Failed to get the results from the API"""
+
+    def __init__(self, message, error_code):
+        super().__init__(message)
+        self.error_code = error_code
+
+
+class CommandError(MyFiskerApiError):
+    """The vehicle did not run a remote command"""
+
+
+class RequestConnectionError(MyFiskerApiError):
+    """Failed to make the request to the API"""
+
+
+class RequestTimeoutError(MyFiskerApiError):
+    """Failed to get the results from the API"""
+
+
+class RequestRetryError(MyFiskerApiError):
+    """Retries too many times"""
+
+
+class RequestDataError(MyFiskerApiError):
+    """Data is not valid"""
@@ -0,0 +1,111 @@
+"""Extraction of the flattened digital twin values used by the entities."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DigitalTwinExtractor:
+    """Pull only the keys used by entities out of the nested digital twin.
+
+    The first payload is flattened completely, like MyFiskerAPI.flatten_json,
+    to discover where each wanted key lives. Later payloads are read straight
+    from those paths. Wanted keys not found yet, like the ones only reported
+    while charging, are looked up in every payload until they show up. If the
+    layout of a payload no longer matches, it is flattened completely again and
+    the paths are rediscovered.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self._keys = frozenset(keys)
+        self._paths: tuple[tuple[str, tuple], ...] | None = None
+        self._missing: frozenset[str] = self._keys
+
+    def extract(self, digital_twin: dict) -> dict:
+        """Return the flattened values of the wanted keys."""
+        if self._paths is not None:
+            out = {}
+            try:
+                for key, path in self._paths:
+                    value = digital_twin
+                    for part in path:
+                        value = value[part]
+                    out[key] = value
+            except (KeyError, IndexError, TypeError):
+                _LOGGER.debug("Digital twin layout changed, discovering it again")
+            else:
+                if self._missing:
+                    self._find_missing(digital_twin, out)
+                return out
+
+        return self.discover(digital_twin)
+
+    def discover(self, digital_twin: dict) -> dict:
+        """Flatten the whole payload, remembering the paths of the wanted keys.
+
+        Returns the values of the wanted keys only, like extract.
+        """
+        out = {}
+        paths = []
+
+        def flatten(x, name, path):
+            if type(x) is dict:
+                for a in x:
+                    flatten(x[a], name + a + "_", path + (a,))
+            elif type(x) is list:
+                for i, a in enumerate(x):
+                    flatten(a, name + str(i) + "_", path + (i,))
+            else:
+                key = name[:-1]
+                if key in self._keys:
+                    out[key] = x
+                    paths.append((key, path))
+
+        flatten(digital_twin, "", ())
+        self._paths = tuple(paths)
+        self._missing = self._keys.difference(key for key, _ in paths)
+        return out
+
+    def _find_missing(self, digital_twin: dict, out: dict):
+        """Look up the wanted keys without a path, remembering those found."""
+        found = []
+        for key in self._missing:
+            if (path := _find_path(digital_twin, key, ())) is not None:
+                value = digital_twin
+                for part in path:
+                    value = value[part]
+                out[key] = value
+                found.append((key, path))
+
+        if found:
+            _LOGGER.debug("Digital twin reports %s now", [key for key, _ in found])
+            self._paths += tuple(found)
+            self._missing = self._missing.difference(key for key, _ in found)
+
+
+def _find_path(node, key: str, path: tuple) -> tuple | None:
+    """Return the path of the value flattened to key, None if there is none.
+
+    Only the branches whose names are a prefix of the key are followed, so this
+    is much cheaper than flattening the whole payload.
+    """
+    if type(node) is dict:
+        children = node.items()
+    elif type(node) is list:
+        children = enumerate(node)
+    else:
+        return None
+
+    for part, child in children:
+        name = str(part)
+        if key == name:
+            if type(child) not in (dict, list):
+                return path + (part,)
+        elif key.startswith(name + "_"):
+            found = _find_path(child, key[len(name) + 1 :], path + (part,))
+            if found is not None:
+                return found
+    return None
@@ -0,0 +1,96 @@
+"""Polling policies choosing how often the coordinator polls the Fisker gateway."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import math
+
+from .const import (
+    POLL_ACTIVE,
+    POLL_ASLEEP_AFTER,
+    POLL_CHARGING,
+    POLL_MAX,
+    POLL_PARKED,
+    PUSH_FALLBACK_INTERVAL,
+)
+from .timestamps import parse_timestamp
+
+
+class PollingPolicy:
+    """Base class of the policies, polling at a fixed interval."""
+
+    def __init__(self, interval: float = POLL_PARKED):
+        self.interval = interval
+
+    def next_interval(
+        self,
+        digital_twins: dict[str, dict],
+        now: datetime,
+        failures: int = 0,
+        push_active: bool = False,
+    ) -> timedelta:
+        """Return the interval until the next poll.
+
+        Called after every poll with the flattened digital twins by VIN, or no
+        digital twins if the poll failed, and the number of polls that failed
+        in a row.
+        """
+        return timedelta(seconds=self.interval)
+
+
+class AdaptivePollingPolicy(PollingPolicy):
+    """Poll fast while a vehicle is in use and back off while it is asleep.
+
+    Every vehicle gets the interval of its state, and the shortest one is used:
+
+    - driving, or parked with the doors unlocked: POLL_ACTIVE
+    - charging: POLL_CHARGING
+    - parked: POLL_PARKED
+    - asleep, parked and not reporting for POLL_ASLEEP_AFTER: POLL_PARKED,
+      doubled each time its last report gets twice as old, up to POLL_MAX
+
+    Failed polls back off the same way from POLL_ACTIVE. While updates are
+    pushed by the gateway, polling is only a fallback and never more often
+    than PUSH_FALLBACK_INTERVAL.
+    """
+
+    def next_interval(
+        self,
+        digital_twins: dict[str, dict],
+        now: datetime,
+        failures: int = 0,
+        push_active: bool = False,
+    ) -> timedelta:
+        """Return the interval until the next poll."""
+        intervals = [
+            self._vehicle_interval(digital_twin, now)
+            for digital_twin in digital_twins.values()
+        ]
+        interval = min(intervals, default=POLL_PARKED)
+
+        if failures:
+            interval = max(interval, min(POLL_ACTIVE * 2**failures, POLL_MAX))
+        if push_active:
+            interval = max(interval, PUSH_FALLBACK_INTERVAL)
+        return timedelta(seconds=interval)
+
+    def _vehicle_interval(self, digital_twin: dict, now: datetime) -> float:
+        parked = digital_twin.get("gear_in_park") is not False
+        if not parked or digital_twin.get("vehicle_speed_speed"):
+            return POLL_ACTIVE
+        if "charging" in str(digital_twin.get("battery_charge_type", "")):
+            return POLL_CHARGING
+        if (age := self._age(digital_twin, now)) >= POLL_ASLEEP_AFTER:
+            # From the age, so extra polls, like after a command, do not add up
+            doublings = int(math.log2(age / POLL_ASLEEP_AFTER))
+            return min(POLL_PARKED * 2**doublings, POLL_MAX)
+        if digital_twin.get("door_locks_driver") is False:
+            return POLL_ACTIVE
+        return POLL_PARKED
+
+    @staticmethod
+    def _age(digital_twin: dict, now: datetime) -> float:
+        """Return the seconds since the vehicle last reported, 0 if unknown."""
+        if (updated := parse_timestamp(digital_twin.get("updated"))) is None:
+            return 0
+        return (now - updated).total_seconds()
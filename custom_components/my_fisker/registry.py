@@ -0,0 +1,75 @@
+"""Registry of the entity descriptions of all platforms, by key."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from homeassistant.const import Platform
+from homeassistant.helpers.entity import EntityDescription
+
+from .const import CAR_SETTINGS, CHARGESTAT, DIGITAL_TWIN, HANDLER_COMMAND, TRIPSTAT
+from .entities_binary_sensor import BINARY_SENSORS
+from .entities_button import BUTTON_ENTITIES
+from .entities_sensor import (
+    SENSORS_CAR_SETTINGS,
+    SENSORS_DIGITAL_TWIN,
+    SENSORS_ChargeStat,
+    SENSORS_tripSTAT,
+)
+
+
+class DescriptionRegistry:
+    """Entity descriptions by platform and key, grouped by the source of their data.
+
+    The source is the handler of the frame an entity shows a value of, like
+    digital_twin or car_settings, or tripstat/chargestat for the values
+    calculated by the coordinator.
+    """
+
+    def __init__(self):
+        self._by_key: dict[tuple[Platform, str], EntityDescription] = {}
+        self._by_source: dict[tuple[Platform, str], list[EntityDescription]] = {}
+        self._sources: dict[str, set[str]] = {}
+
+    def register(
+        self,
+        platform: Platform,
+        source: str,
+        descriptions: Iterable[EntityDescription],
+    ):
+        """Add the descriptions of entities of a platform showing data of source."""
+        for description in descriptions:
+            self._by_key[platform, description.key] = description
+            self._by_source.setdefault((platform, source), []).append(description)
+            self._sources.setdefault(source, set()).add(description.key)
+
+    def get(self, platform: Platform, key: str) -> EntityDescription | None:
+        """Return the description of a key on a platform, None if it has none."""
+        return self._by_key.get((platform, key))
+
+    def descriptions(
+        self, platform: Platform | None = None, source: str | None = None
+    ) -> list[EntityDescription]:
+        """Return the descriptions of a platform and source, by default of all."""
+        return [
+            description
+            for (desc_platform, desc_source), descriptions in self._by_source.items()
+            if platform in (None, desc_platform) and source in (None, desc_source)
+            for description in descriptions
+        ]
+
+    def keys(self, source: str) -> frozenset[str]:
+        """Return the keys of the entities of all platforms showing data of source."""
+        return frozenset(self._sources.get(source, ()))
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in keys for keys in self._sources.values())
+
+
+REGISTRY = DescriptionRegistry()
+REGISTRY.register(Platform.SENSOR, DIGITAL_TWIN, SENSORS_DIGITAL_TWIN)
+REGISTRY.register(Platform.SENSOR, CAR_SETTINGS, SENSORS_CAR_SETTINGS)
+REGISTRY.register(Platform.SENSOR, TRIPSTAT, SENSORS_tripSTAT)
+REGISTRY.register(Platform.SENSOR, CHARGESTAT, SENSORS_ChargeStat)
+REGISTRY.register(Platform.BINARY_SENSOR, DIGITAL_TWIN, BINARY_SENSORS)
+REGISTRY.register(Platform.BUTTON, HANDLER_COMMAND, BUTTON_ENTITIES)
@@ -0,0 +1,154 @@
+"""Retries and a circuit breaker around the requests towards the Fisker gateway."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+import logging
+import random
+import time
+from typing import Any, TypeVar
+
+from .const import (
+    BREAKER_JITTER,
+    BREAKER_RESET_MAX,
+    BREAKER_RESET_MIN,
+    BREAKER_THRESHOLD,
+    RETRY_ATTEMPTS,
+    RETRY_DELAY_MAX,
+    RETRY_DELAY_MIN,
+)
+from .exceptions import RequestConnectionError, RequestRetryError
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+async def async_retry(
+    request: Callable[[], Awaitable[_T]],
+    attempts: int = RETRY_ATTEMPTS,
+    delay_min: float = RETRY_DELAY_MIN,
+    delay_max: float = RETRY_DELAY_MAX,
+) -> _T:
+    """Return the result of request, retrying it if the gateway cannot be reached.
+
+    Waits a random time of up to delay_min, doubled for every attempt and at
+    most delay_max, between attempts, so entries do not retry in step. Raises
+    RequestRetryError once all attempts failed. Other errors, like a timeout
+    or a rejected token, are raised right away.
+    """
+    for attempt in range(attempts):
+        try:
+            return await request()
+        except RequestConnectionError as err:
+            if attempt == attempts - 1:
+                raise RequestRetryError(
+                    f"Gave up after {attempts} attempts: {err}"
+                ) from err
+            delay = random.uniform(0, min(delay_min * 2**attempt, delay_max))
+            _LOGGER.debug("Retrying in %.1fs: %s", delay, err)
+            await asyncio.sleep(delay)
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop polling a gateway that keeps failing, and probe it now and then.
+
+    After threshold failures in a row the circuit opens and no requests are
+    let through for the reset timeout. Then a single probe is let through: if
+    it succeeds the circuit closes, otherwise it opens again for twice as long,
+    up to reset_max.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        reset_min: float = BREAKER_RESET_MIN,
+        reset_max: float = BREAKER_RESET_MAX,
+    ):
+        self._threshold = threshold
+        self._reset_min = reset_min
+        self._reset_max = reset_max
+        self._reset_timeout = reset_min
+        self._opened_at = 0.0
+        self._open_for = 0.0
+        self._probing = False
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now.
+
+        Once the reset timeout has passed, the first call is let through as the
+        probe; others are rejected until its outcome is recorded.
+        """
+        if self.state == CircuitState.OPEN and self.retry_after() <= 0:
+            self.state = CircuitState.HALF_OPEN
+            self._probing = False
+        if self.state == CircuitState.HALF_OPEN and not self._probing:
+            _LOGGER.debug("Circuit half open, probing the gateway")
+            self._probing = True
+            return True
+        if self.state == CircuitState.CLOSED:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        """Close the circuit after a request succeeded."""
+        if self.state != CircuitState.CLOSED:
+            _LOGGER.info("Fisker gateway reachable again, resuming polls")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._probing = False
+        self._reset_timeout = self._reset_min
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit after too many in a row."""
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN:
+            self._reset_timeout = min(self._reset_timeout * 2, self._reset_max)
+            self._open()
+        elif self.state == CircuitState.CLOSED and self.failures >= self._threshold:
+            self._open()
+
+    def retry_after(self) -> float:
+        """Return the seconds until a probe is let through, 0 if not open."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(self._opened_at + self._open_for - time.monotonic(), 0.0)
+
+    def _open(self):
+        if self.state == CircuitState.CLOSED:
+            _LOGGER.warning(
+                "Fisker gateway failed %s times in a row, pausing polls", self.failures
+            )
+        self.state = CircuitState.OPEN
+        self.trips += 1
+        self._probing = False
+        # Jittered, so entries opened together do not probe together
+        self._open_for = self._reset_timeout * random.uniform(
+            1 - BREAKER_JITTER, 1 + BREAKER_JITTER
+        )
+        self._opened_at = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state and counters of the circuit."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retry_after": self.retry_after(),
+        }
@@ -0,0 +1,160 @@
+"""Poll scheduler shared by all My Fisker config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+import random
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    SCHEDULER_BURST,
+    SCHEDULER_JITTER,
+    SCHEDULER_MAX_CONCURRENT,
+    SCHEDULER_RATE,
+)
+from .shared import async_get_shared
+
+DATA_SCHEDULER = "scheduler"
+
+# Spreads the phases of any number of entries evenly over an interval
+GOLDEN_RATIO = 0.6180339887
+
+
+@dataclass
+class SchedulerStats:
+    """Counters of the polls let through and the time they waited for a slot."""
+
+    polls: int = 0
+    throttled: int = 0
+    lag_last: float = 0.0
+    lag_max: float = 0.0
+    lag_total: float = 0.0
+
+    def add(self, lag: float, throttled: bool):
+        """Count a poll that waited lag seconds for its slot."""
+        self.polls += 1
+        self.throttled += throttled
+        self.lag_last = lag
+        self.lag_max = max(self.lag_max, lag)
+        self.lag_total += lag
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the counters as a dictionary, with the average lag."""
+        out = asdict(self)
+        out["lag_avg"] = self.lag_total / self.polls if self.polls else 0.0
+        return out
+
+
+class MyFiskerScheduler:
+    """Keep the polls of all config entries from bunching up.
+
+    Each coordinator is given a phase, so entries set up together do not keep
+    polling together, and every interval is jittered so they do not line up
+    again later. Polls then take a token from a bucket refilled at a fixed rate
+    and one of a limited number of slots, so bursts are smoothed out both on the
+    event loop and towards the gateway.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = SCHEDULER_MAX_CONCURRENT,
+        rate: float = SCHEDULER_RATE,
+        burst: int = SCHEDULER_BURST,
+        jitter: float = SCHEDULER_JITTER,
+    ):
+        self.max_concurrent = max_concurrent
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.stats = SchedulerStats()
+
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._phases = 0
+        self._pollers: set[ScheduledPoller] = set()
+
+    @callback
+    def async_register(self) -> ScheduledPoller:
+        """Return the poller of a new coordinator."""
+        phase = (self._phases * GOLDEN_RATIO) % 1
+        self._phases += 1
+        poller = ScheduledPoller(self, phase)
+        self._pollers.add(poller)
+        return poller
+
+    @callback
+    def async_unregister(self, poller: ScheduledPoller):
+        """Forget the poller of a coordinator that is unloaded."""
+        self._pollers.discard(poller)
+
+    async def _async_take_token(self) -> bool:
+        """Wait for a token, returning True if the rate limit held the poll back."""
+        throttled = False
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled) * self.rate
+            )
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return throttled
+
+            throttled = True
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def as_dict(self) -> dict:
+        """Return the settings and counters for diagnostics."""
+        return {
+            "coordinators": len(self._pollers),
+            "max_concurrent": self.max_concurrent,
+            "rate": self.rate,
+            "burst": self.burst,
+            "jitter": self.jitter,
+            **self.stats.as_dict(),
+        }
+
+
+class ScheduledPoller:
+    """The share of one coordinator in the scheduler."""
+
+    def __init__(self, scheduler: MyFiskerScheduler, phase: float):
+        self._scheduler = scheduler
+        self._phase = phase
+        self.stats = SchedulerStats()
+
+    def next_interval(self, interval: timedelta) -> timedelta:
+        """Return the jittered interval until the next poll.
+
+        The first interval is stretched by the phase of the coordinator.
+        """
+        seconds = interval.total_seconds()
+        jitter = self._scheduler.jitter
+        seconds *= 1 + random.uniform(-jitter, jitter) + self._phase
+        self._phase = 0
+        return timedelta(seconds=seconds)
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        """Wait for the rate limit and a free slot, and hold the slot meanwhile."""
+        scheduler = self._scheduler
+        start = time.monotonic()
+        throttled = await scheduler._async_take_token()
+        async with scheduler._semaphore:
+            lag = time.monotonic() - start
+            self.stats.add(lag, throttled)
+            scheduler.stats.add(lag, throttled)
+            yield
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> MyFiskerScheduler:
+    """Return the scheduler shared by all config entries, creating it on first use."""
+    return async_get_shared(hass).async_get(DATA_SCHEDULER, MyFiskerScheduler)
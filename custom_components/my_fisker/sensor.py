@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Callable
 import logging
-
-import pytz
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -13,26 +12,23 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import FiskerSensorEntityDescription, MyFiskerCoordinator
 from .const import (
+    CAR_SETTINGS,
+    CHARGESTAT,
     CLIMATE_CONTROL_SEAT_HEAT,
     DOMAIN,
     LIST_CLIMATE_CONTROL_SEAT_HEAT,
     MANUCFACTURER,
     MODEL,
-    TRIM_EXTREME_ULTRA_BATT_CAPACITY,
-    TRIM_SPORT_BATT_CAPACITY,
-)
-from .entities_sensor import (
-    SENSORS_CAR_SETTINGS,
-    SENSORS_DIGITAL_TWIN,
-    SENSORS_ChargeStat,
-    SENSORS_tripSTAT,
+    TRIPSTAT,
 )
+from .registry import REGISTRY
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,12 +49,15 @@ class FiskerSensor(CoordinatorEntity, SensorEntity):
         # self._sensor = sensor
         self._data = client
         self._coordinator = coordinator
-        self.vin = self._coordinator.data["vin"]
+        self.vin = idx[0]
         self.entity_description: FiskerSensorEntityDescription = sensor
-        self._attr_unique_id = f"{self._coordinator.data['vin']}_{sensor.key}"
-        self._attr_name = f"{self._coordinator._alias} {sensor.name}"
+        self._attr_unique_id = f"{self.vin}_{sensor.key}"
+        self._attr_name = f"{self._coordinator.vehicle_name(self.vin)} {sensor.name}"
 
         _LOGGER.info(self._attr_unique_id)
+        self._value = compile_value_handler(coordinator, idx, sensor)
+        # Added after the first refresh, so show its data without waiting for the next
+        self._update_value()
 
         if sensor.native_unit_of_measurement:
             self._attr_native_unit_of_measurement = sensor.native_unit_of_measurement
@@ -75,266 +74,26 @@ class FiskerSensor(CoordinatorEntity, SensorEntity):
         return {
             "identifiers": {
                 # Unique identifiers within a specific domain
-                (DOMAIN, self._coordinator.data["vin"])
+                (DOMAIN, self.vin)
             },
             "manufacturer": MANUCFACTURER,
             "model": MODEL,
-            "name": self._coordinator._alias,
+            "name": self._coordinator.vehicle_name(self.vin),
         }
 
-    @property
-    def battery_capacity(self):
-        # VCF1Z = One, VCF1E = Extreme, VCF1U = Ultra VCF1S = Sport
-        trim_extreme_ultra = ["VCF1Z", "VCF1E", "VCF1U"]
-        trim_sport = ["VCF1s"]
-        if self.vin[0:5] in trim_extreme_ultra:
-            return TRIM_EXTREME_ULTRA_BATT_CAPACITY
-        if self.vin[0:5] in trim_sport:
-            return TRIM_SPORT_BATT_CAPACITY
-        else:
-            return 0
-
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-
-        data_available = False
-
-        self.update_chargestats()
-        self.update_tripstats()
-
-        if "car_settings" in self.entity_description.key:
-            try:
-                value = self.handle_carsettings(self.entity_description.key)
-                data_available = True
-                self._attr_native_value = value
-            except:
-                _LOGGER.debug("car_settings not available")
-
-        elif "tripstat" in self.entity_description.key:
-            self._attr_native_value = self.handle_tripstats(self.entity_description.key)
-
-        elif "chargestat" in self.entity_description.key:
-            self._attr_native_value = self.handle_chargestats(
-                self.entity_description.key
-            )
-
-        else:
-            value = self._coordinator.data[self.idx[1]]
-            data_available = True
-
-            if "seat_heat" in self.entity_description.key:
-                self._attr_native_value = CLIMATE_CONTROL_SEAT_HEAT[value][0]
-            elif "updated" in self.entity_description.key:
-                utc_timestamp = value  #'2025-01-02T13:32:49.585703Z'
-                utc_time = datetime.fromisoformat(utc_timestamp.replace("Z", "+00:00"))
-                hass_tz = self._coordinator._hass.config.time_zone
-                local_time = utc_time.astimezone(pytz.timezone(hass_tz))
-                self._attr_native_value = local_time.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                self._attr_native_value = value
-
-        self._attr_available = data_available
+        self._update_value()
         self.async_write_ha_state()
 
-    def handle_carsettings(self, key):
-        value = "n/a"
-
-        carSetting = self._coordinator.my_fisker_api.GetCarSettings()
-        value = self.entity_description.get_car_settings_value(carSetting)
-
-        if "_updated" in key:
-            utc_timestamp = value["updated"]  #'2025-01-02T13:32:49.585703Z'
-            utc_time = datetime.fromisoformat(utc_timestamp.replace("Z", "+00:00"))
-            hass_tz = self._coordinator._hass.config.time_zone
-            local_time = utc_time.astimezone(pytz.timezone(hass_tz))
-            value = local_time.strftime("%Y-%m-%d %H:%M:%S")
-        else:
-            value = value["value"]
-
-        return value
-
-    def handle_tripstats(self, key):
-        batt_factor = self.battery_capacity / 100
-        value = None
-
-        if "battery" in key:
-            value = round(self._coordinator.tripstats.batt * batt_factor, 2)
-
-        elif "distance" in key:
-            value = self._coordinator.tripstats.dist
-
-        elif "duration" in key:
-            value = self._coordinator.tripstats.time
-
-        elif "_efficiency" in key:
-            value = round(self._coordinator.tripstats.efficiency * batt_factor, 2)
-
-        elif "_efficiency_dist" in key:
-            value = round(self._coordinator.tripstats.efficiency_dist * batt_factor, 2)
-
-        elif "_prevefficiency" in key:
-            value = round(
-                self._coordinator.tripstats.previous_efficiency * batt_factor, 2
-            )
-
-        elif "speed" in key:
-            value = self._coordinator.tripstats.average_speed
-
-        return value
-
-    def handle_chargestats(self, key):
-        batt_factor = self.battery_capacity / 100
-        value = None
-
-        if "battery" in key:
-            value = round(self._coordinator.chargestats.batt * batt_factor, 2)
-
-        if "distance" in key:
-            value = self._coordinator.chargestats.dist
-
-        if "duration" in key:
-            value = self._coordinator.chargestats.time
-
-        if "_efficiency" in key:
-            value = round(self._coordinator.chargestats.efficiency * batt_factor, 2)
-
-        if "_prevefficiency" in key:
-            value = round(
-                self._coordinator.chargestats.previous_efficiency * batt_factor, 2
-            )
-
-        if "speed" in key:
-            value = self._coordinator.chargestats.average_speed
-
-        return value
-
-    def update_tripstats(self):
-        carStartedDriving = False
-        carIsDriving = False
-        carEndedDriving = False
-
-        if self._coordinator.tripstats.vehicleParked is True:
-            if (
-                self._coordinator.tripstats.vehicleParked
-                != self._coordinator.data["gear_in_park"]
-            ):
-                # _LOGGER.info("carStartedDriving")
-                carStartedDriving = True
-
-        if (
-            self._coordinator.tripstats.vehicleParked is False
-            and self._coordinator.data["gear_in_park"] is False
-        ):
-            # _LOGGER.info("carIsDriving")
-            carIsDriving = True
-
-        if (
-            self._coordinator.tripstats.vehicleParked is False
-            and self._coordinator.data["gear_in_park"] is True
-        ):
-            # _LOGGER.info("carEndedDriving")
-            carEndedDriving = True
-
-        self._coordinator.tripstats.vehicleParked = self._coordinator.data[
-            "gear_in_park"
-        ]
-
-        if carStartedDriving:
-            self._coordinator.tripstats.Clear()
-
-            # Get battery info
-            if "battery_percent" in self.entity_description.key:
-                self._coordinator.tripstats.add_battery(
-                    self._coordinator.data[self.idx[1]]
-                )
-            # Get distance info
-            if "battery_total_mileage_odometer" in self.entity_description.key:
-                self._coordinator.tripstats.add_distance(
-                    self._coordinator.data[self.idx[1]]
-                )
-
-        if carIsDriving:
-            # Get battery info
-            if "battery_percent" in self.entity_description.key:
-                prevBatt = self._attr_native_value
-
-                # Save battery info
-                if prevBatt != self._coordinator.data[self.idx[1]]:
-                    self._coordinator.tripstats.add_battery(
-                        self._coordinator.data[self.idx[1]]
-                    )
-
-            # Get distance info
-            if "battery_total_mileage_odometer" in self.entity_description.key:
-                prevDist = self._attr_native_value
-
-                # Save distance info
-                if prevDist != self._coordinator.data[self.idx[1]]:
-                    self._coordinator.tripstats.add_distance(
-                        self._coordinator.data[self.idx[1]]
-                    )
-
-        elif carEndedDriving:
-            pass
-
-    def update_chargestats(self):
-        carIsCharging = False
-        carEndedCharging = False
-
-        if self._coordinator.chargestats.carIsRunning is False:
-            carIsCharging = True
-
-        if carIsCharging:
-            if "Initial_value" in self._coordinator.data["battery_charge_type"]:
-                carIsCharging = False
-                carEndedCharging = True
-
-        # Remember if vehicle is 'charging' and/or 'parked'
-        self._coordinator.chargestats.carIsRunning = (
-            "charging" not in self._coordinator.data["battery_charge_type"]
-        )
-        self._coordinator.chargestats.vehicleParked = self._coordinator.data[
-            "gear_in_park"
-        ]
-
-        if carEndedCharging:
-            self._coordinator.chargestats.Clear()
-
-            # Get battery info
-            if "battery_percent" in self.entity_description.key:
-                self._coordinator.chargestats.add_battery(
-                    self._coordinator.data[self.idx[1]]
-                )
-
-            # Get distance info
-            if "battery_total_mileage_odometer" in self.entity_description.key:
-                self._coordinator.chargestats.add_distance(
-                    self._coordinator.data[self.idx[1]]
-                )
-
-        if carIsCharging is False:
-            # Get battery info
-            if "battery_percent" in self.entity_description.key:
-                prevBatt = self._attr_native_value
-
-                # Save battery info
-                if prevBatt != self._coordinator.data[self.idx[1]]:
-                    self._coordinator.chargestats.add_battery(
-                        self._coordinator.data[self.idx[1]]
-                    )
-
-            # Get distance info
-            if "battery_total_mileage_odometer" in self.entity_description.key:
-                prevDist = self._attr_native_value
-
-                # Save distance info
-                if prevDist != self._coordinator.data[self.idx[1]]:
-                    self._coordinator.chargestats.add_distance(
-                        self._coordinator.data[self.idx[1]]
-                    )
-        else:
-            pass
+    def _update_value(self):
+        try:
+            self._attr_native_value = self._value()
+            self._attr_available = True
+        except (KeyError, TypeError, ValueError):
+            # Not received yet, like the car settings right after a restart
+            self._attr_available = False
 
     @property
     def should_poll(self):
@@ -360,11 +119,37 @@ class FiskerSensor(CoordinatorEntity, SensorEntity):
         return state
 
 
-# Get an item by its key
-def get_sensor_by_key(key):
-    for sensor in SENSORS_DIGITAL_TWIN:
-        if sensor.key == key:
-            return sensor
+def compile_value_handler(
+    coordinator: MyFiskerCoordinator, idx, sensor: FiskerSensorEntityDescription
+) -> Callable[[], Any]:
+    """Return a function returning the native value of a sensor.
+
+    All decisions on how to get and convert the value are taken here, once, so
+    an update is a single call. The function raises KeyError, TypeError or
+    ValueError while the value is not available.
+    """
+    vin, source = idx
+    key = sensor.key
+    format_local = coordinator.timestamps.format_local
+
+    if source in (TRIPSTAT, CHARGESTAT):
+        # Calculated once per update by the coordinator
+        return lambda: coordinator.stats[vin][key]
+
+    if source == CAR_SETTINGS:
+        get_car_settings = coordinator.my_fisker_api.GetCarSettings
+        name = sensor.car_setting
+        if key.endswith("_updated"):
+            # Parsed when the car settings arrived
+            return lambda: format_local(get_car_settings(vin)[name].updated)
+        return lambda: get_car_settings(vin)[name].value
+
+    if "seat_heat" in key:
+        return lambda: CLIMATE_CONTROL_SEAT_HEAT[coordinator.data[vin][key]][0]
+    if "updated" in key:
+        # '2025-01-02T13:32:49.585703Z', the same string until the car reports again
+        return lambda: format_local(coordinator.data[vin][key])
+    return lambda: coordinator.data[vin][key]
 
 
 async def async_setup_entry(
@@ -378,17 +163,23 @@ async def async_setup_entry(
 
     entities: list[FiskerSensor] = []
 
-    # for sensor in SENSORS:
-    for idx in enumerate(coordinator.data):
-        sens = get_sensor_by_key(idx[1])
-        if sens is None:
-            _LOGGER.warning(idx[1])
-        else:
-            entities.append(FiskerSensor(coordinator, idx, sens, my_Fisker_data))
+    # One set of sensors per vehicle, the context is the (VIN, key) they show
+    for vin, digital_twin in coordinator.data.items():
+        for key in digital_twin:
+            sens = REGISTRY.get(Platform.SENSOR, key)
+            if sens is None:
+                if key not in REGISTRY:
+                    _LOGGER.debug("No entity for digital twin key '%s'", key)
+            else:
+                entities.append(
+                    FiskerSensor(coordinator, (vin, key), sens, my_Fisker_data)
+                )
 
-    entities.extend(FiskerSensor(coordinator, 100, sensor, my_Fisker_data) for sensor in SENSORS_CAR_SETTINGS)
-    entities.extend(FiskerSensor(coordinator, 200, sensor, my_Fisker_data) for sensor in SENSORS_tripSTAT)
-    entities.extend(FiskerSensor(coordinator, 300, sensor, my_Fisker_data) for sensor in SENSORS_ChargeStat)
+        for source in (CAR_SETTINGS, TRIPSTAT, CHARGESTAT):
+            entities.extend(
+                FiskerSensor(coordinator, (vin, source), sensor, my_Fisker_data)
+                for sensor in REGISTRY.descriptions(Platform.SENSOR, source)
+            )
 
     # Add entities to Home Assistant
     async_add_entities(entities)
@@ -396,4 +187,4 @@ async def async_setup_entry(
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     # Code for setting up your platform inside of the event loop
-    _LOGGER.debug("async_setup_platform")
\ No newline at end of file
+    _LOGGER.debug("async_setup_platform")
@@ -0,0 +1,61 @@
+"""Services shared by all My Fisker config entries and flows."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import inspect
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+# Next to the config entries in hass.data[DOMAIN], keyed by entry ID
+DATA_SHARED = "shared"
+
+_T = TypeVar("_T")
+
+
+class MyFiskerShared:
+    """Create each shared service once and tear them all down together."""
+
+    def __init__(self):
+        self._services: dict[str, Any] = {}
+        self._on_teardown: list[Callable[[], Any]] = []
+
+    @callback
+    def async_get(self, key: str, factory: Callable[[], _T]) -> _T:
+        """Return the service stored under key, creating it with factory on first use."""
+        if (service := self._services.get(key)) is None:
+            service = self._services[key] = factory()
+        return service
+
+    @callback
+    def async_on_teardown(self, func: Callable[[], Any]):
+        """Call func, a function or coroutine function, when the services are torn down."""
+        self._on_teardown.append(func)
+
+    async def async_teardown(self):
+        """Release what the services hold and forget them."""
+        self._services.clear()
+        while self._on_teardown:
+            if inspect.isawaitable(result := self._on_teardown.pop()()):
+                await result
+
+
+@callback
+def async_get_shared(hass: HomeAssistant) -> MyFiskerShared:
+    """Return the shared services, creating them on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (shared := domain_data.get(DATA_SHARED)) is None:
+        shared = domain_data[DATA_SHARED] = MyFiskerShared()
+    return shared
+
+
+async def async_unload_shared(hass: HomeAssistant):
+    """Tear the shared services down once no config entry is loaded any more."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if domain_data.keys() - {DATA_SHARED}:
+        return
+    if (shared := domain_data.pop(DATA_SHARED, None)) is not None:
+        await shared.async_teardown()
@@ -0,0 +1,66 @@
+"""Deduplication of concurrent requests towards the Fisker gateway."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class FlightStats:
+    """Counters of the calls for one handler and those that joined another's request."""
+
+    calls: int = 0
+    requests: int = 0
+    collapsed: int = 0
+
+
+class SingleFlight:
+    """Let concurrent callers asking for the same handler share one request.
+
+    Every request of a handler, like digital_twin, asks for all vehicles at once
+    and stores the replies in the same place, so there is one flight per handler.
+    The first call starts the request; calls made while it is in flight wait for
+    it and get the same result, or the same exception.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self.stats: dict[str, FlightStats] = {}
+
+    async def run(self, handler: str, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of request, or of the one in flight for handler."""
+        stats = self.stats.setdefault(handler, FlightStats())
+        stats.calls += 1
+
+        if (flight := self._in_flight.get(handler)) is not None:
+            stats.collapsed += 1
+            _LOGGER.debug("Joining the '%s' request in flight", handler)
+            return await asyncio.shield(flight)
+
+        # A task, so a caller being cancelled does not cancel it for the others
+        flight = self._in_flight[handler] = asyncio.ensure_future(request())
+        flight.add_done_callback(lambda _: self._land(handler, flight))
+        stats.requests += 1
+        return await asyncio.shield(flight)
+
+    def _land(self, handler: str, flight: asyncio.Future):
+        if self._in_flight.get(handler) is flight:
+            del self._in_flight[handler]
+        # Its callers may all have been cancelled, so nobody else reads the error
+        if not flight.cancelled():
+            flight.exception()
+
+    def cancel(self):
+        """Cancel the requests in flight."""
+        for flight in self._in_flight.values():
+            flight.cancel()
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        """Return the counters by handler."""
+        return {handler: asdict(stats) for handler, stats in self.stats.items()}
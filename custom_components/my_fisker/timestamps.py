@@ -0,0 +1,100 @@
+"""Timestamp conversion shared by all My Fisker config entries."""
+
+from __future__ import annotations
+
+from datetime import datetime, tzinfo
+from functools import lru_cache
+
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
+from homeassistant.core import Event, HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .shared import async_get_shared
+
+DATA_TIMESTAMPS = "timestamps"
+
+# Far more distinct timestamps than the few each vehicle reports at a time
+CACHE_SIZE = 256
+
+LOCAL_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_timestamp(value: str) -> datetime | None:
+    """Return the datetime of a timestamp like '2025-01-02T13:32:49.585703Z', None if invalid."""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TimestampService:
+    """Convert the timestamps reported by the gateway to the time zone of Home Assistant.
+
+    The time zone is resolved once, and again only when the configuration of
+    Home Assistant changes. Conversions are memoized, so the same timestamps
+    reported poll after poll cost a dictionary lookup.
+    """
+
+    def __init__(self, time_zone: tzinfo):
+        self._time_zone = time_zone
+        self._formatted: dict[str | datetime, str] = {}
+
+    @callback
+    def set_time_zone(self, time_zone: tzinfo):
+        """Convert to another time zone from now on."""
+        self._time_zone = time_zone
+        self._formatted.clear()
+
+    def as_datetime(self, value: str | datetime) -> datetime | None:
+        """Return a timestamp as a datetime, None if it is not a valid one."""
+        if isinstance(value, datetime):
+            return value
+        return parse_timestamp(value)
+
+    def as_local(self, value: str | datetime) -> datetime | None:
+        """Return a timestamp as a datetime in the local time zone, None if invalid."""
+        if (timestamp := self.as_datetime(value)) is None:
+            return None
+        return timestamp.astimezone(self._time_zone)
+
+    def format_local(self, value: str | datetime) -> str:
+        """Return a timestamp formatted in the local time zone.
+
+        Raises ValueError if the value is not a valid timestamp.
+        """
+        try:
+            return self._formatted[value]
+        except KeyError:
+            pass
+
+        if (local_time := self.as_local(value)) is None:
+            raise ValueError(f"Invalid timestamp: {value}")
+        if len(self._formatted) >= CACHE_SIZE:
+            self._formatted.clear()
+        formatted = self._formatted[value] = local_time.strftime(LOCAL_FORMAT)
+        return formatted
+
+
+def _time_zone(hass: HomeAssistant) -> tzinfo:
+    return dt_util.get_time_zone(hass.config.time_zone) or dt_util.UTC
+
+
+@callback
+def async_get_timestamps(hass: HomeAssistant) -> TimestampService:
+    """Return the timestamp service shared by all config entries, creating it on first use."""
+    shared = async_get_shared(hass)
+
+    def create() -> TimestampService:
+        service = TimestampService(_time_zone(hass))
+
+        @callback
+        def _async_core_config_updated(event: Event):
+            service.set_time_zone(_time_zone(hass))
+
+        shared.async_on_teardown(
+            hass.bus.async_listen(EVENT_CORE_CONFIG_UPDATE, _async_core_config_updated)
+        )
+        return service
+
+    return shared.async_get(DATA_TIMESTAMPS, create)
@@ -0,0 +1,6 @@
+"""Offline simulator of the Fisker cloud, for benchmarking the My Fisker integration."""
+
+from .gateway import GatewaySimulator, SimulatorStats
+from .recording import Recording, available
+
+__all__ = ["GatewaySimulator", "Recording", "SimulatorStats", "available"]
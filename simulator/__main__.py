@@ -0,0 +1,107 @@
+"""Command line of the gateway simulator.
+
+Serve the bundled drive recording at ten times real time:
+
+    python -m simulator serve --recording drive --speed 10
+
+Record an hour of frames from a real vehicle:
+
+    python -m simulator record --username ... --password ... --region EU \\
+        --duration 3600 my_drive.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from .gateway import GatewaySimulator
+from .recorder import record
+from .recording import Recording, available
+
+
+async def serve(args: argparse.Namespace):
+    simulator = GatewaySimulator(
+        [Recording.load(name) for name in args.recording or ["parked_night"]],
+        speed=args.speed,
+        loop=not args.once,
+        step=args.step,
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        auth_failure_rate=args.auth_failure_rate,
+        token_lifetime=args.token_lifetime,
+        seed=args.seed,
+    )
+    await simulator.start(args.host, args.port)
+    print(f"Serving {', '.join(simulator.vehicles)} on {simulator.url}")
+    print(f"Point the integration at it with base_url={simulator.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        print(simulator.stats.as_dict())
+        await simulator.stop()
+
+
+async def record_to_file(args: argparse.Namespace):
+    recording = await record(
+        Path(args.output).stem,
+        args.username,
+        args.password,
+        args.region,
+        args.duration,
+        args.interval,
+    )
+    recording.save(args.output)
+    print(f"{len(recording.frames)} frames written to {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m simulator")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_serve = commands.add_parser("serve", help="serve recorded vehicles")
+    parser_serve.add_argument(
+        "--recording",
+        action="append",
+        help=f"file or bundled recording ({', '.join(available())}), once per vehicle",
+    )
+    parser_serve.add_argument("--host", default="127.0.0.1")
+    parser_serve.add_argument("--port", type=int, default=8765)
+    parser_serve.add_argument(
+        "--speed", type=float, default=1.0, help="replay speed, 0 holds the first frame"
+    )
+    parser_serve.add_argument("--once", action="store_true", help="do not loop")
+    parser_serve.add_argument(
+        "--step",
+        action="store_true",
+        help="answer every digital_twin request with the next frame, without pushing",
+    )
+    parser_serve.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser_serve.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser_serve.add_argument("--drop-rate", type=float, default=0.0)
+    parser_serve.add_argument("--auth-failure-rate", type=float, default=0.0)
+    parser_serve.add_argument("--token-lifetime", type=float, default=3600)
+    parser_serve.add_argument("--seed", type=int)
+
+    parser_record = commands.add_parser("record", help="record a real vehicle")
+    parser_record.add_argument("output")
+    parser_record.add_argument("--username", required=True)
+    parser_record.add_argument("--password", required=True)
+    parser_record.add_argument("--region", choices=["EU", "US"], default="EU")
+    parser_record.add_argument("--duration", type=float, default=3600)
+    parser_record.add_argument("--interval", type=float, default=60)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        asyncio.run(serve(args) if args.command == "serve" else record_to_file(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""Local stand-in for the Fisker login endpoint and the /mobile WebSocket gateway."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import Counter
+import copy
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+import itertools
+import json
+import logging
+import random
+import secrets
+import time
+
+from aiohttp import WSMsgType, web
+
+from .recording import Recording
+
+_LOGGER = logging.getLogger(__name__)
+
+# Changes to the digital twin once a remote command has been carried out
+COMMAND_RESULTS = {
+    "doors_lock": {"door_locks": {"all": True, "driver": True}},
+    "doors_unlock": {"door_locks": {"all": False, "driver": False}},
+    "trunk_open": {"doors": {"trunk": True}},
+    "trunk_close": {"doors": {"trunk": False}},
+    "california_mode": {
+        "windows": {
+            "left_front": 100,
+            "left_rear": 100,
+            "left_rear_quarter": 100,
+            "rear_windshield": 100,
+            "right_front": 100,
+            "right_rear": 100,
+            "right_rear_quarter": 100,
+        }
+    },
+}
+
+
+@dataclass
+class SimulatorStats:
+    """Counters of what the simulator has served."""
+
+    logins: int = 0
+    login_failures: int = 0
+    connections: int = 0
+    verify_failures: int = 0
+    drops: int = 0
+    frames_sent: int = 0
+    frames_pushed: int = 0
+    requests: Counter = field(default_factory=Counter)
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dictionary."""
+        out = asdict(self)
+        out["requests"] = dict(self.requests)
+        return out
+
+
+class _Vehicle:
+    """Current state of a vehicle replayed from a recording."""
+
+    def __init__(self, recording: Recording):
+        self.recording = recording
+        self.vin = recording.vin
+        self.digital_twin = recording.first("digital_twin")
+        try:
+            self.car_settings = recording.first("car_settings")
+        except KeyError:
+            self.car_settings = {"handler": "car_settings", "data": []}
+        self._steps = itertools.cycle(
+            frame for _, frame in recording.frames if frame["handler"] == "digital_twin"
+        )
+
+    def step(self):
+        """Move on to the next recorded digital twin."""
+        self.digital_twin = next(self._steps)
+
+    def apply_command(self, command: str) -> bool:
+        """Apply the result of a remote command, returning False if unsupported."""
+        if (result := COMMAND_RESULTS.get(command)) is None:
+            return False
+
+        frame = copy.deepcopy(self.digital_twin)
+        for group, values in result.items():
+            frame["data"].setdefault(group, {}).update(values)
+        frame["data"]["updated"] = _utcnow()
+        self.digital_twin = frame
+        return True
+
+
+class _Client:
+    """A WebSocket connected to the simulator."""
+
+    def __init__(self, ws: web.WebSocketResponse):
+        self.ws = ws
+        self.verified = False
+        self.subscriptions: set[str] = set()
+
+
+class GatewaySimulator:
+    """Serve recorded vehicles the way the Fisker cloud does.
+
+    POST /auth/login hands out JWT access tokens and GET /mobile speaks the
+    verify, profiles, digital_twin, car_settings and remote_command handlers.
+    Every recording is served as a vehicle of the account. Its frames are
+    replayed at speed times real time and pushed to the sockets that requested
+    the digital twin of that vehicle. A speed of 0 holds the first frames.
+    Like the real gateway, the car_settings frames do not tell which vehicle
+    they are about.
+    With step, nothing is pushed and every digital_twin request is answered
+    with the next recorded frame instead, giving repeatable runs.
+
+    Latency, dropped connections and failing logins can be injected through
+    the matching attributes, also while the simulator is running.
+    """
+
+    def __init__(
+        self,
+        recordings: list[Recording],
+        *,
+        speed: float = 1.0,
+        loop: bool = True,
+        step: bool = False,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        auth_failure_rate: float = 0.0,
+        token_lifetime: float = 3600,
+        seed: int | None = None,
+    ):
+        self.vehicles = {v.vin: v for v in map(_Vehicle, recordings)}
+        self.speed = speed
+        self.loop = loop
+        self.step = step
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.auth_failure_rate = auth_failure_rate
+        self.token_lifetime = token_lifetime
+        self.stats = SimulatorStats()
+        self.url = ""
+
+        self._random = random.Random(seed)
+        self._tokens: dict[str, float] = {}
+        self._clients: set[_Client] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._runner: web.AppRunner | None = None
+
+    async def __aenter__(self) -> GatewaySimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and replaying, returning the base URL of the simulator."""
+        app = web.Application()
+        app.router.add_post("/auth/login", self._login)
+        app.router.add_get("/mobile", self._mobile)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+
+        if self.speed > 0 and not self.step:
+            started = asyncio.get_running_loop().time()
+            for vehicle in self.vehicles.values():
+                self._spawn(self._replay(vehicle, started))
+
+        _LOGGER.info("Fisker gateway simulator serving %s", self.url)
+        return self.url
+
+    async def stop(self):
+        """Stop replaying and close all connections."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for client in list(self._clients):
+            await client.ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _fail(self, rate: float) -> bool:
+        return rate > 0 and self._random.random() < rate
+
+    def _create_token(self) -> str:
+        expiry = int(time.time() + self.token_lifetime)
+        header = _b64({"alg": "HS256", "typ": "JWT"})
+        payload = _b64({"sub": "simulator", "exp": expiry})
+        token = f"{header}.{payload}.{secrets.token_urlsafe(32)}"
+        self._tokens[token] = expiry
+        return token
+
+    async def _login(self, request: web.Request) -> web.Response:
+        params = await request.post()
+        await self._delay()
+
+        if not params.get("username") or self._fail(self.auth_failure_rate):
+            self.stats.login_failures += 1
+            return web.json_response(
+                {"message": "Invalid username or password"}, status=401
+            )
+
+        self.stats.logins += 1
+        return web.json_response({"accessToken": self._create_token()})
+
+    async def _mobile(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats.connections += 1
+
+        client = _Client(ws)
+        self._clients.add(client)
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                message = json.loads(msg.data)
+                if message.get("handler") == "verify":
+                    # Requests pipelined behind verify are read once it is answered
+                    await self._verify(client, message)
+                elif client.verified:
+                    self._spawn(self._handle(client, message))
+                else:
+                    _LOGGER.debug("Ignoring '%s' before verify", message.get("handler"))
+        finally:
+            self._clients.discard(client)
+        return ws
+
+    async def _verify(self, client: _Client, message: dict):
+        token = message.get("data", {}).get("token", "")
+        client.verified = self._tokens.get(token, 0) > time.time() and not self._fail(
+            self.auth_failure_rate
+        )
+        self.stats.requests["verify"] += 1
+        if not client.verified:
+            self.stats.verify_failures += 1
+
+        authenticated = "true" if client.verified else "false"
+        await self._reply(
+            client, {"handler": "verify", "data": {"authenticated": authenticated}}
+        )
+        if client.verified:
+            for vehicle in self.vehicles.values():
+                await self._send(client, vehicle.car_settings)
+
+    async def _handle(self, client: _Client, message: dict):
+        handler = message.get("handler")
+        data = message.get("data") or {}
+        self.stats.requests[handler] += 1
+
+        match handler:
+            case "profiles":
+                profiles = [
+                    {"vin": vin, "name": vehicle.recording.name, "role": "owner"}
+                    for vin, vehicle in self.vehicles.items()
+                ]
+                await self._reply(client, {"handler": "profiles", "data": profiles})
+
+            case "digital_twin" if vehicle := self.vehicles.get(data.get("vin")):
+                if self.step:
+                    vehicle.step()
+                else:
+                    client.subscriptions.add(vehicle.vin)
+                await self._reply(client, vehicle.digital_twin)
+
+            case "car_settings" if vehicle := self.vehicles.get(data.get("vin")):
+                await self._reply(client, vehicle.car_settings)
+
+            case "remote_command" if vehicle := self.vehicles.get(data.get("vin")):
+                command = data.get("command", "")
+                status = "ok" if vehicle.apply_command(command) else "unsupported"
+                await self._reply(
+                    client,
+                    {
+                        "handler": "remote_command",
+                        "data": {
+                            "vin": vehicle.vin,
+                            "command": command,
+                            "status": status,
+                        },
+                    },
+                )
+                if status == "ok":
+                    await self._publish(vehicle, vehicle.digital_twin)
+
+            case _:
+                _LOGGER.debug("Not answering %s", message)
+
+    async def _replay(self, vehicle: _Vehicle, started: float):
+        loop = asyncio.get_running_loop()
+        offset = 0.0
+        while True:
+            for t, frame in vehicle.recording.frames:
+                delay = started + (offset + t) / self.speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._publish(vehicle, frame)
+
+            if not self.loop or vehicle.recording.duration <= 0:
+                return
+            offset += vehicle.recording.duration
+
+    async def _publish(self, vehicle: _Vehicle, frame: dict):
+        if frame["handler"] == "digital_twin":
+            vehicle.digital_twin = frame
+            clients = [c for c in self._clients if vehicle.vin in c.subscriptions]
+        else:
+            vehicle.car_settings = frame
+            clients = [c for c in self._clients if c.verified]
+
+        self.stats.frames_pushed += len(clients)
+        await asyncio.gather(
+            *(self._send(client, frame) for client in clients), return_exceptions=True
+        )
+
+    async def _delay(self):
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+    async def _reply(self, client: _Client, frame: dict):
+        await self._delay()
+        await self._send(client, frame)
+
+    async def _send(self, client: _Client, frame: dict):
+        if client.ws.closed:
+            return
+
+        await client.ws.send_str(json.dumps(frame))
+        self.stats.frames_sent += 1
+
+        if self._fail(self.drop_rate):
+            self.stats.drops += 1
+            self._clients.discard(client)
+            await client.ws.close()
+
+
+def _b64(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")[:-6] + "Z"
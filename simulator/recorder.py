@@ -0,0 +1,68 @@
+"""Record the frames sent by the Fisker gateway for later replay."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import aiohttp
+
+from custom_components.my_fisker.api import MyFiskerAPI, headers
+from custom_components.my_fisker.connection import MyFiskerConnection
+from custom_components.my_fisker.const import (
+    CAR_SETTINGS,
+    DIGITAL_TWIN,
+    PROFILES,
+    WSS_URL_EU,
+    WSS_URL_US,
+)
+
+from .recording import Recording
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def record(
+    name: str,
+    username: str,
+    password: str,
+    region: str,
+    duration: float,
+    interval: float = 60,
+) -> Recording:
+    """Record the digital_twin and car_settings frames of the first vehicle.
+
+    Besides the frames pushed by the gateway, the digital twin is requested
+    every interval seconds, like the integration does when push is not active.
+    """
+    recording = Recording(name)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    def on_frame(frame: dict, solicited: bool):
+        recording.add(loop.time() - started, frame)
+
+    async with aiohttp.ClientSession() as session:
+        api = MyFiskerAPI(username, password, region, session=session)
+        await api.GetAuthTokenAsync()
+
+        connection = MyFiskerConnection(
+            WSS_URL_EU if region == "EU" else WSS_URL_US,
+            headers,
+            session,
+            api.tokenReturn,
+        )
+        connection.register(DIGITAL_TWIN, on_frame)
+        connection.register(CAR_SETTINGS, on_frame)
+        try:
+            vin = api.ParseProfilesResponse(
+                await connection.request(api.GenerateProfilesRequest(), PROFILES)
+            )[0]
+            while (elapsed := loop.time() - started) < duration:
+                await connection.request(api.DigitalTwinRequest(vin), DIGITAL_TWIN)
+                _LOGGER.info("%d frames recorded", len(recording.frames))
+                await asyncio.sleep(min(interval, duration - elapsed))
+        finally:
+            await connection.close()
+
+    return recording
@@ -0,0 +1,72 @@
+"""Recorded frame sequences replayed by the gateway simulator.
+
+A recording is a JSON lines file. Each line holds one frame as sent by the
+gateway and the time in seconds, relative to the start of the recording, at
+which it arrived:
+
+    {"t": 0.0, "frame": {"handler": "digital_twin", "data": {...}}}
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+
+RECORDINGS = Path(__file__).parent / "recordings"
+
+
+@dataclass
+class Recording:
+    """A timed sequence of digital_twin and car_settings frames of one vehicle."""
+
+    name: str
+    frames: list[tuple[float, dict]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Return the time of the last frame in seconds."""
+        return self.frames[-1][0] if self.frames else 0.0
+
+    @property
+    def vin(self) -> str:
+        """Return the VIN of the recorded vehicle."""
+        return self.first("digital_twin")["data"]["vin"]
+
+    def first(self, handler: str) -> dict:
+        """Return the first recorded frame of a handler."""
+        for _, frame in self.frames:
+            if frame["handler"] == handler:
+                return frame
+        raise KeyError(f"Recording '{self.name}' has no '{handler}' frame")
+
+    def add(self, t: float, frame: dict):
+        """Append a frame received t seconds after the start of the recording."""
+        self.frames.append((t, frame))
+
+    @classmethod
+    def load(cls, path: str | Path) -> Recording:
+        """Load a recording from a file, or by name from the bundled recordings."""
+        path = Path(path)
+        if not path.exists() and not path.suffix:
+            path = RECORDINGS / f"{path.name}.jsonl"
+
+        recording = cls(path.stem)
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    recording.add(float(entry["t"]), entry["frame"])
+        recording.frames.sort(key=lambda entry: entry[0])
+        return recording
+
+    def save(self, path: str | Path):
+        """Write the recording as JSON lines."""
+        with open(path, "w", encoding="utf-8") as file:
+            for t, frame in self.frames:
+                file.write(json.dumps({"t": round(t, 3), "frame": frame}) + "\n")
+
+
+def available() -> list[str]:
+    """Return the names of the bundled recordings."""
+    return sorted(path.stem for path in RECORDINGS.glob("*.jsonl"))
@@ -0,0 +1,155 @@
+"""Tests of the routing of frames by the gateway connection."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import aiohttp
+
+from custom_components.my_fisker.connection import ConnectionState, MyFiskerConnection
+
+VIN_1 = "VCF1ZBU27PG000001"
+VIN_2 = "VCF1ZBU27PG000002"
+
+
+async def get_token() -> str:
+    return "token"
+
+
+def make_connection() -> MyFiskerConnection:
+    return MyFiskerConnection("ws://gateway", {}, None, get_token)
+
+
+def wait_for(
+    connection: MyFiskerConnection, handler: str, vin: str | None
+) -> asyncio.Future:
+    """Register a request waiting for handler, like send does."""
+    future = asyncio.get_running_loop().create_future()
+    connection._waiters.setdefault(handler, []).append((vin, future))
+    return future
+
+
+def frame(handler: str, vin: str | None = None) -> dict:
+    return {"handler": handler, "data": {} if vin is None else {"vin": vin}}
+
+
+def test_frame_with_vin_resolves_only_its_vehicle():
+    async def run():
+        connection = make_connection()
+        first = wait_for(connection, "digital_twin", VIN_1)
+        second = wait_for(connection, "digital_twin", VIN_2)
+
+        connection._dispatch("digital_twin", frame("digital_twin", VIN_2))
+
+        assert not first.done()
+        assert second.result()["data"]["vin"] == VIN_2
+
+    asyncio.run(run())
+
+
+def test_frame_with_vin_resolves_requests_without_one():
+    async def run():
+        connection = make_connection()
+        any_vehicle = wait_for(connection, "digital_twin", None)
+
+        connection._dispatch("digital_twin", frame("digital_twin", VIN_1))
+
+        assert any_vehicle.done()
+
+    asyncio.run(run())
+
+
+def test_frame_without_vin_resolves_requests_without_one():
+    async def run():
+        connection = make_connection()
+        first = wait_for(connection, "car_settings", VIN_1)
+        any_vehicle = wait_for(connection, "car_settings", None)
+
+        connection._dispatch("car_settings", frame("car_settings"))
+
+        assert any_vehicle.done()
+        assert not first.done()
+
+    asyncio.run(run())
+
+
+def test_frame_without_vin_resolves_only_the_oldest_request():
+    async def run():
+        connection = make_connection()
+        first = wait_for(connection, "car_settings", VIN_1)
+        second = wait_for(connection, "car_settings", VIN_2)
+
+        connection._dispatch("car_settings", frame("car_settings"))
+        assert first.done()
+        assert not second.done()
+
+        connection._dispatch("car_settings", frame("car_settings"))
+        assert second.done()
+
+    asyncio.run(run())
+
+
+def test_routes_are_told_if_a_request_was_waiting():
+    async def run():
+        connection = make_connection()
+        calls = []
+        connection.register(
+            "digital_twin", lambda f, solicited: calls.append(solicited)
+        )
+        wait_for(connection, "digital_twin", VIN_1)
+
+        connection._dispatch("digital_twin", frame("digital_twin", VIN_1))
+        connection._dispatch("digital_twin", frame("digital_twin", VIN_1))
+
+        assert calls == [True, False]
+
+    asyncio.run(run())
+
+
+class FakeWebSocket:
+    """Socket yielding the given messages, then closing."""
+
+    def __init__(self, *messages: str):
+        self._messages = [
+            SimpleNamespace(type=aiohttp.WSMsgType.TEXT, data=data) for data in messages
+        ]
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for message in self._messages:
+            yield message
+        self.closed = True
+
+    async def close(self):
+        self.closed = True
+
+
+def test_malformed_frames_do_not_close_the_connection():
+    async def run():
+        connection = make_connection()
+        states = []
+
+        def on_digital_twin(frame, solicited):
+            states.append(connection.state)
+            frame["data"]["missing"]
+
+        connection.register("digital_twin", on_digital_twin)
+        reply = wait_for(connection, "digital_twin", VIN_1)
+        ws = connection._ws = FakeWebSocket(
+            json.dumps({"handler": "verify", "data": {"authenticated": True}}),
+            "not json",
+            "[1]",
+            json.dumps({"data": {}}),
+            json.dumps(frame("digital_twin", VIN_1)),
+        )
+
+        await connection._read_loop(ws)
+
+        assert states == [ConnectionState.READY]
+        assert reply.result()["data"]["vin"] == VIN_1
+        assert connection.state == ConnectionState.DISCONNECTED
+
+    asyncio.run(run())
@@ -0,0 +1,102 @@
+"""Tests of the state the entities show."""
+
+from types import SimpleNamespace
+
+from homeassistant.const import Platform
+import homeassistant.util.dt as dt_util
+
+from custom_components.my_fisker import binary_sensor, sensor
+from custom_components.my_fisker.api import MyFiskerAPI
+from custom_components.my_fisker.const import CAR_SETTINGS
+from custom_components.my_fisker.registry import REGISTRY
+from custom_components.my_fisker.timestamps import TimestampService
+
+VIN = "VCF1ZBU27PG000001"
+
+
+def make_coordinator(digital_twin: dict) -> SimpleNamespace:
+    """Return a stand-in for the coordinator after its first refresh."""
+    return SimpleNamespace(
+        data={VIN: digital_twin},
+        stats={VIN: {}},
+        my_fisker_api=MyFiskerAPI("user", "password", "EU", VIN),
+        timestamps=TimestampService(dt_util.UTC),
+        vehicle_name=lambda vin: "Ocean",
+    )
+
+
+def make_sensor(coordinator, key: str) -> sensor.FiskerSensor:
+    description = REGISTRY.get(Platform.SENSOR, key)
+    return sensor.FiskerSensor(coordinator, (VIN, key), description, None)
+
+
+def make_binary_sensor(coordinator, key: str) -> binary_sensor.FiskerSensor:
+    description = REGISTRY.get(Platform.BINARY_SENSOR, key)
+    return binary_sensor.FiskerSensor(coordinator, (VIN, key), description, None)
+
+
+def test_sensor_shows_the_first_refresh_when_added():
+    coordinator = make_coordinator(
+        {"battery_percent": 80, "updated": "2025-01-02T13:32:49.585703Z"}
+    )
+
+    battery = make_sensor(coordinator, "battery_percent")
+    updated = make_sensor(coordinator, "updated")
+
+    assert battery.native_value == 80
+    assert updated.native_value == "2025-01-02 13:32:49"
+
+
+def test_sensor_without_a_value_is_unknown():
+    coordinator = make_coordinator({})
+
+    battery = make_sensor(coordinator, "battery_percent")
+
+    assert battery.native_value is None
+
+
+def test_car_settings_sensor_shows_the_settings_once_received():
+    coordinator = make_coordinator({})
+    description = next(iter(REGISTRY.descriptions(Platform.SENSOR, CAR_SETTINGS)))
+    entity = sensor.FiskerSensor(coordinator, (VIN, CAR_SETTINGS), description, None)
+    assert entity.native_value is None
+
+    api = coordinator.my_fisker_api
+    api.data[CAR_SETTINGS] = {
+        VIN: api.ParseCarSettingsResponse(
+            {
+                "handler": CAR_SETTINGS,
+                "data": [
+                    {
+                        "name": description.car_setting,
+                        "value": "3.1",
+                        "updated": "2025-01-02T13:32:49.585703Z",
+                    }
+                ],
+            }
+        )
+    }
+    entity._update_value()
+
+    assert entity.native_value == "3.1"
+
+
+def test_binary_sensor_shows_the_first_refresh_when_added():
+    coordinator = make_coordinator({"door_locks_all": True, "gear_in_park": True})
+
+    locks = make_binary_sensor(coordinator, "door_locks_all")
+    gear = make_binary_sensor(coordinator, "gear_in_park")
+
+    assert locks.state is True
+    assert gear.state is not None
+
+
+def test_binary_sensor_follows_coordinator_updates():
+    coordinator = make_coordinator({"door_locks_all": True})
+    locks = make_binary_sensor(coordinator, "door_locks_all")
+    locks.async_write_ha_state = lambda: None
+
+    coordinator.data = {VIN: {"door_locks_all": False}}
+    locks._handle_coordinator_update()
+
+    assert locks.state is False
@@ -0,0 +1,68 @@
+"""Tests of the digital twin extractor."""
+
+from custom_components.my_fisker.api import MyFiskerAPI
+from custom_components.my_fisker.extractor import DigitalTwinExtractor
+
+TWIN = {
+    "updated": "2025-01-02T13:32:49.585703Z",
+    "battery": {"percent": 80, "max_miles": 300},
+    "doors": {"hood": False, "trunk": False},
+    "windows": [{"position": 0}, {"position": 10}],
+}
+
+
+def test_discover_returns_only_wanted_keys():
+    extractor = DigitalTwinExtractor({"battery_percent", "windows_1_position"})
+
+    assert extractor.discover(TWIN) == {
+        "battery_percent": 80,
+        "windows_1_position": 10,
+    }
+
+
+def test_extract_matches_flatten_json():
+    flattened = MyFiskerAPI("user", "password", "EU").flatten_json(TWIN)
+    extractor = DigitalTwinExtractor(flattened)
+
+    assert extractor.extract(TWIN) == flattened
+    # Read from the discovered paths this time
+    assert extractor.extract(TWIN) == flattened
+
+
+def test_extract_returns_the_same_keys_as_discover():
+    extractor = DigitalTwinExtractor({"battery_percent", "doors_hood", "unknown"})
+
+    discovered = extractor.discover(TWIN)
+
+    assert extractor.extract(TWIN) == discovered
+
+
+def test_keys_missing_from_the_first_payload_are_picked_up():
+    extractor = DigitalTwinExtractor({"battery_percent", "charging_remaining"})
+    assert extractor.extract(TWIN) == {"battery_percent": 80}
+
+    charging = {**TWIN, "charging": {"remaining": 42}}
+
+    assert extractor.extract(charging) == {
+        "battery_percent": 80,
+        "charging_remaining": 42,
+    }
+    assert extractor.extract(charging) == extractor.discover(charging)
+
+
+def test_key_reported_inside_a_list_later_is_picked_up():
+    extractor = DigitalTwinExtractor({"windows_2_position"})
+    assert extractor.extract(TWIN) == {}
+
+    more_windows = {**TWIN, "windows": TWIN["windows"] + [{"position": 5}]}
+
+    assert extractor.extract(more_windows) == {"windows_2_position": 5}
+
+
+def test_changed_layout_is_discovered_again():
+    extractor = DigitalTwinExtractor({"battery_percent"})
+    extractor.extract(TWIN)
+
+    moved = {**TWIN, "battery": 80, "battery_percent": 75}
+
+    assert extractor.extract(moved) == {"battery_percent": 75}
@@ -0,0 +1,76 @@
+"""Tests of the adaptive polling policy."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.my_fisker.const import (
+    POLL_ACTIVE,
+    POLL_ASLEEP_AFTER,
+    POLL_CHARGING,
+    POLL_MAX,
+    POLL_PARKED,
+    PUSH_FALLBACK_INTERVAL,
+)
+from custom_components.my_fisker.policy import AdaptivePollingPolicy
+
+NOW = datetime(2025, 1, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def twin(age: float = 0, **values) -> dict:
+    """Return a parked, locked vehicle that last reported age seconds ago."""
+    updated = (NOW - timedelta(seconds=age)).isoformat().replace("+00:00", "Z")
+    return {
+        "updated": updated,
+        "gear_in_park": True,
+        "vehicle_speed_speed": 0,
+        "battery_charge_type": "Initial_value",
+        "door_locks_driver": True,
+        **values,
+    }
+
+
+def interval(*digital_twins: dict, **kwargs) -> float:
+    twins = {str(i): digital_twin for i, digital_twin in enumerate(digital_twins)}
+    return AdaptivePollingPolicy().next_interval(twins, NOW, **kwargs).total_seconds()
+
+
+def test_vehicle_states():
+    assert interval(twin()) == POLL_PARKED
+    assert interval(twin(gear_in_park=False)) == POLL_ACTIVE
+    assert interval(twin(vehicle_speed_speed=30)) == POLL_ACTIVE
+    assert interval(twin(door_locks_driver=False)) == POLL_ACTIVE
+    assert interval(twin(battery_charge_type="charging_ac")) == POLL_CHARGING
+
+
+def test_no_vehicles_polls_as_parked():
+    assert interval() == POLL_PARKED
+
+
+def test_asleep_backs_off_with_the_age_of_the_last_report():
+    assert interval(twin(POLL_ASLEEP_AFTER)) == POLL_PARKED
+    assert interval(twin(2 * POLL_ASLEEP_AFTER)) == 2 * POLL_PARKED
+    assert interval(twin(3 * POLL_ASLEEP_AFTER)) == 2 * POLL_PARKED
+    assert interval(twin(4 * POLL_ASLEEP_AFTER)) == 4 * POLL_PARKED
+    assert interval(twin(1000 * POLL_ASLEEP_AFTER)) == POLL_MAX
+
+
+def test_asleep_while_charging_keeps_polling_as_charging():
+    asleep = twin(100 * POLL_ASLEEP_AFTER, battery_charge_type="charging_dc")
+    assert interval(asleep) == POLL_CHARGING
+
+
+def test_shortest_vehicle_interval_wins():
+    assert interval(twin(100 * POLL_ASLEEP_AFTER), twin(gear_in_park=False)) == (
+        POLL_ACTIVE
+    )
+
+
+def test_failures_back_off():
+    assert interval(twin(gear_in_park=False), failures=1) == 2 * POLL_ACTIVE
+    assert interval(twin(), failures=2) == 4 * POLL_ACTIVE
+    assert interval(twin(), failures=20) == POLL_MAX
+
+
+def test_push_only_falls_back_to_polling():
+    assert interval(twin(gear_in_park=False), push_active=True) == (
+        PUSH_FALLBACK_INTERVAL
+    )
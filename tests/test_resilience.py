@@ -0,0 +1,87 @@
+"""Tests of the retries and the circuit breaker."""
+
+import asyncio
+
+import pytest
+
+from custom_components.my_fisker.exceptions import (
+    RequestConnectionError,
+    RequestRetryError,
+    RequestTimeoutError,
+)
+from custom_components.my_fisker.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    async_retry,
+)
+
+
+def test_retry_returns_once_the_gateway_answers():
+    attempts = []
+
+    async def request():
+        attempts.append(None)
+        if len(attempts) < 3:
+            raise RequestConnectionError("refused")
+        return "reply"
+
+    result = asyncio.run(async_retry(request, delay_min=0, delay_max=0))
+
+    assert result == "reply"
+    assert len(attempts) == 3
+
+
+def test_retry_gives_up_after_the_attempts():
+    async def request():
+        raise RequestConnectionError("refused")
+
+    with pytest.raises(RequestRetryError):
+        asyncio.run(async_retry(request, attempts=2, delay_min=0, delay_max=0))
+
+
+def test_retry_raises_other_errors_right_away():
+    attempts = []
+
+    async def request():
+        attempts.append(None)
+        raise RequestTimeoutError("no reply")
+
+    with pytest.raises(RequestTimeoutError):
+        asyncio.run(async_retry(request, delay_min=0, delay_max=0))
+    assert len(attempts) == 1
+
+
+def test_breaker_opens_after_the_threshold():
+    breaker = CircuitBreaker(threshold=2, reset_min=60)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() > 0
+
+
+def test_breaker_lets_a_single_probe_through_once_reset():
+    breaker = CircuitBreaker(threshold=1, reset_min=0)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_failed_probe_opens_for_longer():
+    breaker = CircuitBreaker(threshold=1, reset_min=0, reset_max=0)
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.trips == 2
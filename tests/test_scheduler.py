@@ -0,0 +1,33 @@
+"""Tests of the poll scheduler shared by the config entries."""
+
+from datetime import timedelta
+
+from custom_components.my_fisker.scheduler import MyFiskerScheduler
+
+
+def test_diagnostics_count_the_registered_coordinators():
+    scheduler = MyFiskerScheduler()
+    first = scheduler.async_register()
+    second = scheduler.async_register()
+    assert scheduler.as_dict()["coordinators"] == 2
+
+    scheduler.async_unregister(first)
+    scheduler.async_unregister(first)
+
+    assert scheduler.as_dict()["coordinators"] == 1
+    scheduler.async_unregister(second)
+    assert scheduler.as_dict()["coordinators"] == 0
+
+
+def test_coordinators_registered_later_get_new_phases():
+    scheduler = MyFiskerScheduler(jitter=0)
+    first = scheduler.async_register()
+    scheduler.async_unregister(first)
+    second = scheduler.async_register()
+
+    interval = timedelta(seconds=100)
+
+    assert first.next_interval(interval) == interval
+    assert second.next_interval(interval) > interval
+    # Only the first interval is stretched by the phase
+    assert second.next_interval(interval) == interval
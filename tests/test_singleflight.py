@@ -0,0 +1,89 @@
+"""Tests of the deduplication of concurrent requests."""
+
+import asyncio
+
+import pytest
+
+from custom_components.my_fisker.exceptions import RequestTimeoutError
+from custom_components.my_fisker.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_request():
+    async def run():
+        flights = SingleFlight()
+        requests = []
+
+        async def request():
+            requests.append(None)
+            await asyncio.sleep(0)
+            return {"vin": "VCF1ZBU27PG000001"}
+
+        results = await asyncio.gather(
+            *(flights.run("digital_twin", request) for _ in range(3))
+        )
+
+        assert len(requests) == 1
+        assert results[0] is results[1] is results[2]
+        assert flights.as_dict()["digital_twin"] == {
+            "calls": 3,
+            "requests": 1,
+            "collapsed": 2,
+        }
+
+    asyncio.run(run())
+
+
+def test_calls_after_landing_send_a_new_request():
+    async def run():
+        flights = SingleFlight()
+        requests = []
+
+        async def request():
+            requests.append(None)
+            return len(requests)
+
+        assert await flights.run("profiles", request) == 1
+        assert await flights.run("profiles", request) == 2
+
+    asyncio.run(run())
+
+
+def test_error_is_raised_to_every_caller():
+    async def run():
+        flights = SingleFlight()
+
+        async def request():
+            await asyncio.sleep(0)
+            raise RequestTimeoutError("no reply")
+
+        results = await asyncio.gather(
+            flights.run("digital_twin", request),
+            flights.run("digital_twin", request),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RequestTimeoutError) for result in results)
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_cancel_the_request():
+    async def run():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def request():
+            await release.wait()
+            return "reply"
+
+        first = asyncio.ensure_future(flights.run("car_settings", request))
+        second = asyncio.ensure_future(flights.run("car_settings", request))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "reply"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(run())